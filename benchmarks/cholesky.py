@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.molecules import build_molecule
+from hfhsl.scf import scf
+from hfhsl.cholesky import cholesky_vectors
+
+def main():
+    molecules = ['h2', 'co', 'ch4', 'h2o', 'h10']
+    tolerances = [1e-4, 1e-6, 1e-8]
+
+    print('%-6s %10s %8s %8s %10s %10s %10s %12s' %
+          ('Mol', 'Tolerance', 'Vectors', 'Pairs', 'Evaluated', 'Stored', 'Exact',
+           'Error [Ht]'))
+    for name in molecules:
+        cgfs, nuclei = build_molecule(name).build_basis('sto3g')
+        npair = len(cgfs) * (len(cgfs) + 1) // 2
+        ref = scf(cgfs, nuclei, diis=True, strategy='incore', verbose=False)
+        for tolerance in tolerances:
+            L, nevaluated = cholesky_vectors(cgfs, tolerance)
+            res = scf(cgfs, nuclei, diis=True, strategy='cholesky',
+                      cholesky_tol=tolerance, verbose=False)
+            print('%-6s %10.0e %8i %8i %10i %10i %10i %12.2e' %
+                  (name, tolerance, L.shape[1], npair, nevaluated, L.size,
+                   npair * (npair + 1) // 2, res['energy'] - ref['energy']))
+
+if __name__ == '__main__':
+    main()
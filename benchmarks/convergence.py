@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+import time
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.scan import build_geometry
+from hfhsl.scf import scf
+
+def main():
+    distances = [2.116, 3.0, 4.0, 5.0]
+    settings = [
+        ('No stabilization', {'stabilize': False}),
+        ('Automatic', {}),
+        ('Automatic, dE only', {'ptol': None}),
+        ('Automatic, DIIS', {'diis': True}),
+        ('Damping 0.3', {'damping': 0.3}),
+        ('Level shift 0.5', {'level_shift': 0.5}),
+    ]
+
+    print('%-8s %-18s %10s %-12s %18s %8s' %
+          ('r [a.u.]', 'Method', 'Iterations', 'Status', 'Energy [Ht]', 'Time [s]'))
+    for r in distances:
+        mol = build_geometry([('C', 0.0, 0.0, -r/2.0), ('O', 0.0, 0.0, r/2.0)])
+        cgfs, nuclei = mol.build_basis('sto3g')
+        for label, kwargs in settings:
+            t0 = time.perf_counter()
+            res = scf(cgfs, nuclei, verbose=False, **kwargs)
+            print('%-8.3f %-18s %10i %-12s %18.10f %8.3f' %
+                  (r, label, res['niter'], res['status'], res['energy'],
+                   time.perf_counter() - t0))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.molecules import build_molecule
+from hfhsl.scf import calculate
+
+def main():
+    molecules = ['h2', 'co', 'ch4', 'h2o']
+    settings = [
+        ('Roothaan', {}),
+        ('DIIS(6,1)', {'diis': True}),
+        ('DIIS(4,1)', {'diis': True, 'diis_size': 4}),
+        ('DIIS(6,3)', {'diis': True, 'diis_start': 3}),
+    ]
+
+    print('%-6s %-10s %10s %18s' % ('Mol', 'Method', 'Iterations', 'Energy [Ht]'))
+    for name in molecules:
+        for label, kwargs in settings:
+            res = calculate(build_molecule(name), verbose=False, **kwargs)
+            print('%-6s %-10s %10i %18.10f' % (name, label, res['niter'], res['energy']))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+import time
+import numpy as np
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.eigensolver import Eigensolver
+
+def fock_like(N, rng):
+    """
+    Build a symmetric matrix with a spread of diagonal elements and small
+    off-diagonal elements, resembling a Fock matrix close to convergence
+    """
+    A = np.diag(np.sort(rng.normal(size=N)) * 5.0) + rng.normal(size=(N,N)) * 0.05
+
+    return 0.5 * (A + A.transpose())
+
+def best_of(func, repeat=5):
+    """
+    Return the shortest wall time of repeat calls of func
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+def main():
+    rng = np.random.default_rng(0)
+    sizes = [50, 100, 200, 400, 800]
+    fractions = [0.05, 0.1, 0.15, 0.2, 0.3]
+
+    print('%5s %5s %6s %10s %10s %10s %8s' %
+          ('N', 'k', 'k/N', 'Full [ms]', 'Subset', 'LOBPCG', 'Ratio'))
+    for N in sizes:
+        for fraction in fractions:
+            k = max(1, int(fraction * N))
+            A = fock_like(N, rng)
+            timings = {}
+            for method in ('full', 'subset', 'lobpcg'):
+                solver = Eigensolver(k, method)
+                solver.solve(A)
+                start = solver.vectors
+
+                # the next matrix differs slightly, as between two iterations;
+                # every repetition starts from the eigenvectors of A
+                B = A + 1e-4 * fock_like(N, rng)
+                def solve():
+                    solver.vectors = start
+                    solver.solve(B)
+                timings[method] = best_of(solve)
+            print('%5i %5i %6.2f %10.3f %10.3f %10.3f %8.2f' %
+                  (N, k, fraction, 1000 * timings['full'], 1000 * timings['subset'],
+                   1000 * timings['lobpcg'], timings['subset'] / timings['full']))
+
+if __name__ == '__main__':
+    main()
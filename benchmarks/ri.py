@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.molecules import build_molecule
+from hfhsl.scf import scf
+from hfhsl.ri import RIFock
+
+def main():
+    molecules = ['h2', 'co', 'ch4', 'h2o', 'h10', 'benzene']
+
+    print('%-6s %5s %5s %10s %10s %18s %18s %12s' %
+          ('Mol', 'N', 'Naux', 'Exact', 'RI', 'Energy [Ht]', 'RI energy [Ht]', 'Error [Ht]'))
+    for name in molecules:
+        cgfs, nuclei = build_molecule(name).build_basis('sto3g')
+        N = len(cgfs)
+        # number of auxiliary functions left after removing the linear
+        # dependencies and the number of stored values
+        L = RIFock(cgfs, nuclei).L
+        ref = scf(cgfs, nuclei, diis=True, strategy='incore', verbose=False)
+        res = scf(cgfs, nuclei, diis=True, strategy='ri', verbose=False)
+
+        # number of unique integrals which need to be stored
+        npair = N * (N + 1) // 2
+        print('%-6s %5i %5i %10i %10i %18.10f %18.10f %12.2e' %
+              (name, N, L.shape[1], npair * (npair + 1) // 2, L.size,
+               ref['energy'], res['energy'], res['energy'] - ref['energy']))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+import time
+import numpy as np
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.scan import scan
+
+def co(r):
+    """
+    Geometry of CO for a C-O distance r (in Bohr)
+    """
+    return [('C', 0.0, 0.0, -r/2.0), ('O', 0.0, 0.0, r/2.0)]
+
+def main():
+    distances = np.linspace(1.8, 2.6, 17)
+    settings = [
+        ('Zero', 1, {'reuse': False}),
+        ('Reuse', 1, {}),
+        ('Zero+DIIS', 1, {'reuse': False, 'diis': True}),
+        ('Reuse+DIIS', 1, {'diis': True}),
+        ('Reuse+DIIS', 4, {'diis': True}),
+    ]
+
+    print('%-12s %8s %10s %8s %18s' % ('Method', 'Branches', 'Iterations', 'Time [s]',
+                                       'Emin [Ht]'))
+    for label, nbranches, kwargs in settings:
+        t0 = time.perf_counter()
+        results = list(scan(co, distances, nbranches=nbranches, **kwargs))
+        print('%-12s %8i %10i %8.2f %18.10f' %
+              (label, nbranches, sum(r['niter'] for r in results),
+               time.perf_counter() - t0, min(r['energy'] for r in results)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.molecules import build_molecule
+from hfhsl.scf import calculate
+
+def main():
+    molecules = ['h2', 'co', 'ch4', 'h2o', 'h10']
+    thresholds = [1e-12, 1e-10, 1e-8, 1e-6, 1e-4]
+
+    print('%-6s %10s %10s %10s %18s %12s' %
+          ('Mol', 'Threshold', 'Evaluated', 'Skipped', 'Energy [Ht]', 'Error [Ht]'))
+    for name in molecules:
+        ref = calculate(build_molecule(name), verbose=False)
+        print('%-6s %10s %10i %10i %18.10f %12s' %
+              (name, '-', ref['eri_stats']['integrals'], 0, ref['energy'], '-'))
+        for threshold in thresholds:
+            res = calculate(build_molecule(name), threshold=threshold, verbose=False)
+            print('%-6s %10.0e %10i %10i %18.10f %12.2e' %
+                  (name, threshold, res['eri_stats']['integrals'],
+                   res['eri_stats']['skipped'], res['energy'],
+                   res['energy'] - ref['energy']))
+
+if __name__ == '__main__':
+    main()
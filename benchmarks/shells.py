@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+import time
+import numpy as np
+import pyqint
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.molecules import build_molecule
+from hfhsl.oneelectron import one_electron_matrices
+from hfhsl.shells import build_shells
+
+def best_time(func, repeat=3):
+    """
+    Return the result and the shortest wall time of repeat calls to func
+    """
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - t0)
+
+    return result, min(times)
+
+def main():
+    cases = [('co', 'sto3g'), ('ch4', 'sto3g'), ('h10', 'sto3g'), ('co', 'p631'),
+             ('h2o', 'aug-cc-pVDZ'), ('co', 'aug-cc-pVDZ'), ('ch4', 'aug-cc-pVDZ')]
+
+    # the accuracy of the reference depends on the version of PyQInt
+    print('PyQInt %s' % pyqint.__version__)
+
+    print('%-6s %-12s %4s %6s %10s %10s %10s' %
+          ('Mol', 'Basis', 'N', 'Shells', 'Pairs [s]', 'Shells [s]', 'max|dV|'))
+    for name, basis in cases:
+        cgfs, nuclei = build_molecule(name).build_basis(basis)
+        (S1, T1, V1), t1 = best_time(lambda: one_electron_matrices(cgfs, nuclei))
+        (S2, T2, V2), t2 = best_time(lambda: one_electron_matrices(cgfs, nuclei,
+                                                                   method='shells'))
+        print('%-6s %-12s %4i %6i %10.4f %10.4f %10.1e' %
+              (name, basis, len(cgfs), len(build_shells(cgfs)), t1, t2,
+               np.max(np.abs(V1 - V2))))
+
+if __name__ == '__main__':
+    main()
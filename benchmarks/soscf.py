@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+import numpy as np
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.molecules import build_molecule
+from hfhsl.scan import build_geometry
+from hfhsl.scf import scf
+
+def main():
+    molecules = [(name.upper(), build_molecule(name)) for name in ['co', 'ch4', 'h2o', 'h10']]
+    for r in (3.0, 4.0, 5.0):
+        molecules.append(('CO %.1f' % r,
+                          build_geometry([('C', 0.0, 0.0, -r/2.0), ('O', 0.0, 0.0, r/2.0)])))
+    settings = [
+        ('Roothaan', {}),
+        ('DIIS', {'diis': True}),
+        ('SOSCF', {'soscf': True}),
+        ('SOSCF (start)', {'soscf': True, 'soscf_start': np.inf}),
+        ('SOSCF+SAD', {'soscf': True, 'soscf_start': np.inf, 'guess': 'sad'}),
+    ]
+
+    print('%-8s %-14s %11s %6s %-11s %18s' %
+          ('Mol', 'Method', 'Fock builds', 'Switch', 'Status', 'Energy [Ht]'))
+    for name, mol in molecules:
+        cgfs, nuclei = mol.build_basis('sto3g')
+        for label, kwargs in settings:
+            res = scf(cgfs, nuclei, verbose=False, **kwargs)
+            switch = res['soscf_iteration']
+            print('%-8s %-14s %11i %6s %-11s %18.10f' %
+                  (name, label, res['niter'], '-' if switch is None else switch,
+                   res['status'], res['energy']))
+
+if __name__ == '__main__':
+    main()
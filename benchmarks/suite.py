@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import numpy as np
+from pyqint import PyQInt
+from pytessel import PyTessel
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.eri import build_teint
+from hfhsl.fock import InCoreFock
+from hfhsl.molecules import build_molecule
+from hfhsl.oneelectron import one_electron_matrices
+from hfhsl.scf import scf
+
+# the ladder of molecules in order of increasing basis set size
+MOLECULES = ['h2', 'he', 'co', 'ch4', 'h2o', 'benzene']
+
+# the phases that are timed for every molecule; the Fock build and the
+# diagonalization are timed per iteration
+PHASES = ['one_electron', 'eri', 'fock', 'diagonalization', 'scf',
+          'grid', 'marching_cubes', 'write']
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+def best_of(func, repeat):
+    """
+    Return the shortest wall time of repeat calls of func together with
+    the result of the last call
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings), result
+
+def benchmark_molecule(name, basis='sto3g', repeat=3, sz=100):
+    """
+    Time every phase of a Hartree-Fock calculation and of the construction
+    of the isosurfaces of the highest occupied molecular orbital, as done
+    by build_abo in exercise 8, for a single molecule
+    """
+    cgfs, nuclei = build_molecule(name).build_basis(basis)
+    N = len(cgfs)
+    nocc = int(np.sum([n[1] for n in nuclei])) // 2
+    timings = {}
+
+    # integrals; the two-electron integrals are only evaluated once as these
+    # dominate the time of the larger molecules
+    timings['one_electron'], (S, T, V) = best_of(
+        lambda: one_electron_matrices(cgfs, nuclei), repeat)
+    timings['eri'], (teint, _) = best_of(lambda: build_teint(cgfs), 1)
+
+    # the complete SCF procedure from the integrals above; this is repeated
+    # as the first call includes the warm-up of the NumPy routines
+    timings['scf'], res = best_of(
+        lambda: scf(cgfs, nuclei, ints=(S, T, V, teint), strategy='incore',
+                    verbose=False), repeat)
+
+    # a single iteration using the converged density matrix
+    fock = InCoreFock(teint, N)
+    s, U = np.linalg.eigh(S)
+    X = U.dot(np.diag(1.0/np.sqrt(s)))
+    timings['fock'], (G, _) = best_of(lambda: fock.build_g(res['P']), repeat)
+    Fprime = X.transpose().dot(T + V + G).dot(X)
+    timings['diagonalization'], _ = best_of(lambda: np.linalg.eigh(Fprime), repeat)
+
+    # isosurfaces of the highest occupied molecular orbital
+    integrator = PyQInt()
+    pytessel = PyTessel()
+    grid = integrator.build_rectgrid3d(-5, 5, sz)
+    timings['grid'], scalarfield = best_of(
+        lambda: np.reshape(integrator.plot_wavefunction(grid, res['C'][:,nocc-1], cgfs),
+                           (sz, sz, sz)), 1)
+    unitcell = np.diag(np.ones(3) * 10.0)
+    isovalue = 0.03
+    timings['marching_cubes'], surfaces = best_of(
+        lambda: [pytessel.marching_cubes(scalarfield.flatten(), scalarfield.shape,
+                                         unitcell.flatten(), sign * isovalue)
+                 for sign in (1, -1)], 1)
+
+    def write():
+        with tempfile.TemporaryFile() as f:
+            for vertices, normals, indices in surfaces:
+                f.write(np.hstack([vertices * 0.529177, normals]).tobytes())
+                f.write(indices.tobytes())
+    timings['write'], _ = best_of(write, repeat)
+
+    return {
+        'molecule': name,
+        'basis': basis,
+        'N': N,
+        'niter': res['niter'],
+        'energy': res['energy'],
+        'timings': timings,
+    }
+
+def compare(results, baseline, tolerance):
+    """
+    Compare the timings to those of a baseline; returns a list of all
+    phases which are more than a fraction tolerance slower than the
+    baseline. Phases taking less than a millisecond are not compared.
+    """
+    reference = {(r['molecule'], r['basis']): r for r in baseline['results']}
+    regressions = []
+    for res in results:
+        ref = reference.get((res['molecule'], res['basis']))
+        if ref is None:
+            continue
+        for phase in PHASES:
+            old = ref['timings'].get(phase)
+            new = res['timings'][phase]
+            if old is not None and max(old, new) > 1e-3 and new > old * (1.0 + tolerance):
+                regressions.append((res['molecule'], phase, old, new))
+
+    return regressions
+
+def print_results(results):
+    """
+    Print a table of the timings in ms per molecule and phase
+    """
+    print('%-8s %4s %5s ' % ('Mol', 'N', 'Iter') +
+          ' '.join('%14s' % phase for phase in PHASES))
+    for res in results:
+        print('%-8s %4i %5i ' % (res['molecule'], res['N'], res['niter']) +
+              ' '.join('%14.3f' % (1000 * res['timings'][phase]) for phase in PHASES))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the phases of a HF calculation')
+    parser.add_argument('molecules', nargs='*', default=MOLECULES)
+    parser.add_argument('--basis', default='sto3g')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', default=BASELINE,
+                        help='compare the timings to this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative slowdown that is flagged as a regression')
+    args = parser.parse_args()
+
+    results = [benchmark_molecule(name, args.basis, args.repeat) for name in args.molecules]
+    print_results(results)
+
+    output = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, phase, old, new in regressions:
+            print('Regression: %s %s %.3f ms -> %.3f ms' % (name, phase, 1000 * old, 1000 * new))
+        if regressions:
+            sys.exit(1)
+        print('No regressions with respect to %s' % args.baseline)
+
+if __name__ == '__main__':
+    main()
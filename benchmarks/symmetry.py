@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+import time
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.molecules import build_molecule
+from hfhsl.scf import calculate
+
+def main():
+    molecules = [('h2', 'sto3g'), ('co', 'sto3g'), ('ch4', 'sto3g'),
+                 ('h2o', 'sto3g'), ('h10', 'sto3g'), ('h2o', 'p631')]
+
+    print('%-6s %-6s %-5s %4s %8s %8s %10s %10s %9s' %
+          ('Mol', 'Basis', 'Group', 'N', 'ERIs', 'Unique', 'Full [s]',
+           'Sym. [s]', 'dE [Ht]'))
+    for name, basis in molecules:
+        results = []
+        for symmetry in (False, True):
+            start = time.perf_counter()
+            res = calculate(build_molecule(name), basis=basis, verbose=False,
+                            diis=True, strategy='incore', symmetry=symmetry)
+            results.append((res, time.perf_counter() - start))
+        (full, tfull), (sym, tsym) = results
+        stats = sym['eri_stats']
+        print('%-6s %-6s %-5s %4i %8i %8i %10.3f %10.3f %9.1e' %
+              (name, basis, sym['point_group'], len(sym['cgfs']),
+               stats['integrals'] + stats['skipped'], stats['integrals'],
+               tfull, tsym, abs(full['energy'] - sym['energy'])))
+
+if __name__ == '__main__':
+    main()
@@ -19,7 +19,13 @@
 
 from pyqint import PyQInt, cgf
 from copy import deepcopy
-import numpy as np
+import os
+import sys
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.oneelectron import one_electron_matrices
+from hfhsl.teindex import canonical_quartets, teindex
 
 # construct the STO-3g CGF for H
 cgf1 = cgf([0.0, 0.0, 0.0])
@@ -34,12 +40,6 @@ pos2 = (0,0,1.4)        # position of second H nucleus
 cgf2 = deepcopy(cgf1)
 cgf2.p = pos2           # reset its center
 
-# build 2x2 placeholders
-S = np.zeros((2,2))     # overlap matrix
-T = np.zeros((2,2))     # kinetic matrix
-V1 = np.zeros((2,2))    # nuclear attraction matrix for H1
-V2 = np.zeros((2,2))    # nuclear attraction matrix for H2
-
 # build integrator object
 integrator = PyQInt()
 
@@ -47,13 +47,11 @@ integrator = PyQInt()
 # to access them
 cgfs = [cgf1, cgf2]
 
-# calculate the overlap, kinetic energy and nuclear attraction matrices
-for i in range(0,2):
-    for j in range(0,2):
-        S[i,j] = integrator.overlap(cgfs[i], cgfs[j])
-        T[i,j] = integrator.kinetic(cgfs[i], cgfs[j])
-        V1[i,j] = integrator.nuclear(cgfs[i], cgfs[j], pos1, 1.0)
-        V2[i,j] = integrator.nuclear(cgfs[i], cgfs[j], pos2, 1.0)
+# calculate the overlap, kinetic energy and nuclear attraction matrices;
+# as these matrices are symmetric, only the elements with i>=j are
+# evaluated; V holds one nuclear attraction matrix per H nucleus
+S, T, V = one_electron_matrices(cgfs, [[pos1, 1.0], [pos2, 1.0]], per_nucleus=True)
+V1, V2 = V
 
 print('Overlap matrix:\n', S)
 print('Kinetic energy matrix:\n', T)
@@ -64,12 +62,14 @@ print('Nuclear attraction matrix #2:\n', V2)
 # to identify them
 tes = []
 labels = []
+quartets = []
 for i in range(0,2):
     for j in range(0,2):
         for k in range(0,2):
             for l in range(0,2):
                 tes.append(integrator.repulsion(cgfs[i],cgfs[j],cgfs[k],cgfs[l]))
                 labels.append('(%i,%i,%i,%i)' % (i+1, j+1, k+1, l+1))
+                quartets.append((i,j,k,l))
 
 # print all two-electron integrals
 print('Two electron integrals list:')
@@ -77,14 +77,14 @@ for label, te in zip(labels, tes):
     print(label, te)
     
 # Note: the code below is a bit more advanced and is only meant to
-# show you which two-electron integrals are equal
-tedict = {}
-for label, te in zip(labels, tes):
-    value = '%0.4f' % te
-    if value not in tedict:
-        tedict[value] = []
-    tedict[value].append(label)
-
+# show you which two-electron integrals are equal; every integral equals
+# a canonical one with i>=j, k>=l and ij>=kl and integrals sharing the same
+# canonical quartet also share the same index
 print('The following integrals have the same values:')
-for key in tedict.keys():
-    print(tedict[key], key)
\ No newline at end of file
+for i,j,k,l,idx in canonical_quartets(2):
+    group = [label for q,label in zip(quartets, labels) if teindex(*q) == idx]
+    print(group, '%0.4f' % tes[quartets.index((i,j,k,l))])
+
+# note that some of the groups above hold the same value as well; this is
+# caused by the symmetry of the H2 molecule (both H atoms are equivalent)
+# which is not captured by the indices of the integrals
@@ -17,9 +17,15 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from pyqint import PyQInt, cgf
+from pyqint import cgf
 from copy import deepcopy
 import numpy as np
+import os
+import sys
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.oneelectron import one_electron_matrices
 
 # construct the STO-3g CGF for H
 cgf1 = cgf([0.0, 0.0, 0.0])
@@ -34,20 +40,13 @@ pos2 = (0,0,1.4)        # position of second H nucleus
 cgf2 = deepcopy(cgf1)
 cgf2.p = pos2           # reset its center
 
-# build 2x2 placeholders
-S = np.zeros((2,2))     # overlap matrix
-
-# build integrator object
-integrator = PyQInt()
-
 # put the CGFs in a list so that we can use an iterator
 # to access them
 cgfs = [cgf1, cgf2]
 
-# calculate the overlap, kinetic energy and nuclear attraction matrices
-for i in range(0,2):
-    for j in range(0,2):
-        S[i,j] = integrator.overlap(cgfs[i], cgfs[j])
+# calculate the overlap matrix; as this matrix is symmetric, only the
+# elements with i>=j are evaluated (no nuclei are needed for S)
+S, _, _ = one_electron_matrices(cgfs, [])
 
 # calculate eigenvalues and -vectors of the overlap matrix by
 # performing a matrix diagonalization
@@ -20,6 +20,12 @@
 from pyqint import PyQInt, cgf
 from copy import deepcopy
 import numpy as np
+import os
+import sys
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.oneelectron import one_electron_matrices
 
 ############################################
 #
@@ -47,12 +53,6 @@ nuclei = [
 ]
 nelec = 2
 
-# build 2x2 placeholders
-S = np.zeros((2,2))     # overlap matrix
-T = np.zeros((2,2))     # kinetic matrix
-V1 = np.zeros((2,2))    # nuclear attraction matrix for H1
-V2 = np.zeros((2,2))    # nuclear attraction matrix for H2
-
 # build integrator object
 integrator = PyQInt()
 
@@ -66,16 +66,10 @@ cgfs = [cgf1, cgf2]
 #
 ############################################
 
-# calculate the overlap, kinetic energy and nuclear attraction matrices
-for i in range(0,2):
-    for j in range(0,2):
-        S[i,j] = integrator.overlap(cgfs[i], cgfs[j])
-        T[i,j] = integrator.kinetic(cgfs[i], cgfs[j])
-        V1[i,j] = integrator.nuclear(cgfs[i], cgfs[j], pos1, 1.0)
-        V2[i,j] = integrator.nuclear(cgfs[i], cgfs[j], pos2, 1.0)
-
-# add the two nuclear attraction matrices
-V = V1 + V2 # note, this is elementwise addition
+# calculate the overlap, kinetic energy and nuclear attraction matrices;
+# as these matrices are symmetric, only the elements with i>=j are
+# evaluated and the nuclear attraction of both nuclei is summed into V
+S, T, V = one_electron_matrices(cgfs, nuclei)
 
 # build the two-electron integrals: because we want to avoid
 # calculating a similar integral twice, we need some additional
@@ -19,6 +19,12 @@
 
 from pyqint import PyQInt, Molecule
 import numpy as np
+import os
+import sys
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.oneelectron import one_electron_matrices
 
 ############################################
 #
@@ -35,12 +41,6 @@ cgfs, nuclei = mol.build_basis('sto3g')
 nelec = np.sum([n[1] for n in nuclei])
 N = len(cgfs)
 
-# build 2x2 placeholders
-S = np.zeros((N,N))     # overlap matrix
-T = np.zeros((N,N))     # kinetic matrix
-V1 = np.zeros((N,N))    # nuclear attraction matrix for H1
-V2 = np.zeros((N,N))    # nuclear attraction matrix for H2
-
 # build integrator object
 integrator = PyQInt()
 
@@ -50,16 +50,10 @@ integrator = PyQInt()
 #
 ############################################
 
-# calculate the overlap, kinetic energy and nuclear attraction matrices
-for i in range(0,N):
-    for j in range(0,N):
-        S[i,j] = integrator.overlap(cgfs[i], cgfs[j])
-        T[i,j] = integrator.kinetic(cgfs[i], cgfs[j])
-        V1[i,j] = integrator.nuclear(cgfs[i], cgfs[j], nuclei[0][0], nuclei[0][1])
-        V2[i,j] = integrator.nuclear(cgfs[i], cgfs[j], nuclei[1][0], nuclei[1][1])
-
-# add the two nuclear attraction matrices
-V = V1 + V2 # note, this is elementwise addition
+# calculate the overlap, kinetic energy and nuclear attraction matrices;
+# as these matrices are symmetric, only the elements with i>=j are
+# evaluated and the nuclear attraction of both nuclei is summed into V
+S, T, V = one_electron_matrices(cgfs, nuclei)
 
 # calculate two-electron integrals
 teint_calc = np.multiply(np.ones(integrator.teindex(N,N,N,N)), -1.0)
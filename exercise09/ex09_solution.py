@@ -22,6 +22,17 @@ import numpy as np
 from mendeleev import element
 from pytessel import PyTessel
 import os
+import sys
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.fock import unpack_teint, build_g
+from hfhsl.oneelectron import one_electron_matrices
+from hfhsl.teindex import index_map
+from hfhsl.eri import build_teint, print_stats
+from hfhsl.diis import DIIS
+from hfhsl.guess import initial_guess
+from hfhsl.checkpoint import finished, resume, write_checkpoint
 
 def main():
     nuclei, cgfs, coeff, energies = calculate_ch4()
@@ -145,7 +156,23 @@ def build_abo(outfile, nuclei, cgfs, coeff, energies, isovalue):
     print("Creating file: %s" % outfile)
     print("Size: %f MB" % (os.stat(outfile).st_size / (1024*1024)))
 
-def calculate_ch4():
+def calculate_ch4(fock='jk', nprocs=1, threshold=None, cache=None, diis=False,
+                  guess='zero', checkpoint=None):
+    """
+    Perform a HF calculation; the two-electron part of the Fock matrix
+    is built either using batched tensor contractions (fock='jk') or
+    using the explicit quadruple loop (fock='loop'). The two-electron
+    integrals are evaluated using nprocs processes (None: all cores),
+    skipping those with a Cauchy-Schwarz bound below threshold. When an
+    IntegralCache is supplied via cache, the integrals of a previous run
+    of the same geometry are reused. Set diis to accelerate convergence
+    by extrapolating the Fock matrix using DIIS. The initial density
+    matrix is either empty (guess='zero') or obtained from the core
+    Hamiltonian ('core'), the extended Hückel approximation ('gwh') or
+    the superposition of atomic densities ('sad'). When a checkpoint file
+    is given, the state of every iteration is written to this file and a
+    subsequent run resumes from it.
+    """
     ############################################
     #
     # STEP 1: Define nuclei and basis functions
@@ -165,43 +192,35 @@ def calculate_ch4():
     nelec = np.sum([n[1] for n in nuclei])
     N = len(cgfs)
     
-    # build 2x2 placeholders
-    S = np.zeros((N,N))     # overlap matrix
-    T = np.zeros((N,N))     # kinetic matrix
-    V = np.zeros((N,N))     # nuclear attraction matrix for H1
-    
-    # build integrator object
-    integrator = PyQInt()
-    
     ############################################
     #
     # STEP 2: Calculate S,T,V,H,TEINT integrals
     #
     ############################################
     
-    # calculate the overlap, kinetic energy and nuclear attraction matrices
-    for i in range(0,N):
-        for j in range(0,N):
-            S[i,j] = integrator.overlap(cgfs[i], cgfs[j])
-            T[i,j] = integrator.kinetic(cgfs[i], cgfs[j])
-            for k in range(0, len(nuclei)):
-                V[i,j] += integrator.nuclear(cgfs[i], cgfs[j], nuclei[k][0], nuclei[k][1])
+    # take the integrals from a previous run of the same geometry when
+    # these are available in the cache
+    ints = cache.load(nuclei, 'sto3g', threshold) if cache is not None else None
+    if ints is not None:
+        S, T, V, teint = ints
+    else:
+        # calculate the overlap, kinetic energy and nuclear attraction matrices;
+        # as these matrices are symmetric, only the elements with i>=j are
+        # evaluated and the attraction of all nuclei is evaluated per pair
+        S, T, V = one_electron_matrices(cgfs, nuclei, nprocs=nprocs)
+        
+        # calculate two-electron integrals; every unique integral is evaluated
+        # exactly once, distributed over nprocs processes
+        teint, eri_stats = build_teint(cgfs, nprocs=nprocs, threshold=threshold)
+        if nprocs != 1 or threshold is not None:
+            print_stats(eri_stats)
+        
+        if cache is not None:
+            cache.store(nuclei, 'sto3g', S, T, V, teint, threshold=threshold)
     
-    # calculate two-electron integrals
-    teint_calc = np.multiply(np.ones(integrator.teindex(N,N,N,N)), -1.0)
-    teint = np.zeros(integrator.teindex(N,N,N,N))
-    for i, cgf1 in enumerate(cgfs):
-        for j, cgf2 in enumerate(cgfs):
-            ij = i*(i+1)/2 + j
-            for k, cgf3 in enumerate(cgfs):
-                for l, cgf4 in enumerate(cgfs):
-                    kl = k * (k+1)/2 + l
-                    if ij <= kl:
-                        # determine unique identifier for each integral
-                        idx = integrator.teindex(i,j,k,l)
-                        if teint_calc[idx] < 0:
-                            teint_calc[idx] = 1
-                            teint[idx] = integrator.repulsion(cgfs[i], cgfs[j], cgfs[k], cgfs[l])
+    # the compound indices of all two-electron integrals are computed
+    # once and reused throughout the calculation
+    idxmap = index_map(N)
     
     ############################################
     #
@@ -221,33 +240,60 @@ def calculate_ch4():
     #
     #################################################
     
-    # create empty P matrix as initial guess
-    P = np.zeros(S.shape)
+    # create empty P matrix as initial guess or construct one from the
+    # core Hamiltonian or the densities of the individual atoms
+    P = initial_guess(guess, T + V, S, X, int(nelec/2), cgfs, nuclei)
+    
+    # keep track of the previous Fock matrices for the DIIS extrapolation
+    accelerator = DIIS() if diis else None
+    
+    # unpack the two-electron integrals once such that these can be
+    # contracted with the density matrix in a single operation
+    if fock == 'jk':
+        eri = unpack_teint(teint, N)
+    elif fock != 'loop':
+        raise ValueError('Unknown Fock build method: %s' % fock)
+    
+    # continue where a previous run of this geometry stopped
+    start, energies = 0, []
+    if checkpoint is not None:
+        P, start, energies = resume(checkpoint, nuclei, 'sto3g', P, S, X,
+                                    int(nelec/2), accelerator, 'incore')
+        done = finished(checkpoint, nuclei, 'sto3g', 100, 1e-5, None, 'incore')
+        if done is not None:
+            return nuclei, cgfs, done['C'], done['orbital_energies']
     
     # start iterative procedure; it is always good practice to set an
     # upper bound to the number of cycles (here: 100)
-    energies = []
-    for niter in range(0,100):
+    for niter in range(start,100):
         #################################################
         #
         # STEP 5: Calculate G,H,F,F' from P
         #
         #################################################
         
-        G = np.zeros(S.shape)
-        for i in range(S.shape[0]):
-            for j in range(S.shape[0]):
-                for k in range(S.shape[0]):
-                    for l in range(S.shape[0]):
-                        idx_rep = integrator.teindex(i,j,l,k)
-                        idx_exc = integrator.teindex(i,k,l,j)
-                        G[i,j] += P[k,l] * (teint[idx_rep] - 0.5 * teint[idx_exc])
+        if fock == 'jk':
+            G = build_g(P, eri)
+        else:
+            G = np.zeros(S.shape)
+            for i in range(S.shape[0]):
+                for j in range(S.shape[0]):
+                    for k in range(S.shape[0]):
+                        for l in range(S.shape[0]):
+                            idx_rep = idxmap.rep[i,j,l,k]
+                            idx_exc = idxmap.exc[i,j,k,l]
+                            G[i,j] += P[k,l] * (teint[idx_rep] - 0.5 * teint[idx_exc])
         
         # build Fock matrix
         F = T + V + G
         
-        # transform Fock matrix
-        Fprime = X.transpose().dot(F).dot(X)
+        # transform Fock matrix; when using DIIS, the extrapolated Fock
+        # matrix is used to obtain the new orbitals whereas the energy is
+        # still evaluated using the Fock matrix of the current density
+        if accelerator is not None:
+            Fprime = X.transpose().dot(accelerator.extrapolate(F, P, S)).dot(X)
+        else:
+            Fprime = X.transpose().dot(F).dot(X)
         
         #################################################
         #
@@ -309,11 +355,18 @@ def calculate_ch4():
         # note that convergence is here based purely on the energies,
         # alternatively, it can be based on the values of the density
         # matrix
-        if niter > 1:
-            ediff = np.abs(energy - energies[-1])
-            if ediff < 1e-5:
-                print("Stopping SCF cycle, convergence reached.")
-                break
+        converged = niter > 1 and np.abs(energy - energies[-1]) < 1e-5
+        
+        # store the state of this iteration such that an interrupted
+        # calculation can be resumed
+        if checkpoint is not None:
+            write_checkpoint(checkpoint, nuclei, 'sto3g', niter, energies + [energy],
+                             C, P, F, e, accelerator, converged, 1e-5, None,
+                             'incore')
+        
+        if converged:
+            print("Stopping SCF cycle, convergence reached.")
+            break
         
         # store energy for next iteration
         energies.append(energy)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import time
+import traceback
+from .molecules import MOLECULES
+from .scan import build_geometry
+from .scf import calculate
+
+def molecule_jobs(names, basis='sto3g'):
+    """
+    Build the job definitions for molecules of hfhsl.molecules.MOLECULES
+    """
+    return [{'name': name, 'atoms': MOLECULES[name], 'basis': basis} for name in names]
+
+def basis_size(job):
+    """
+    Return the number of basis functions of a job or 0 when its basis set
+    cannot be constructed
+    """
+    try:
+        cgfs, _ = build_geometry(job['atoms'], job['name']).build_basis(job.get('basis', 'sto3g'))
+    except Exception:
+        return 0
+
+    return len(cgfs)
+
+def run_job(job, kwargs):
+    """
+    Perform the SCF calculation of a single job; any error is captured in
+    the result rather than raised
+    """
+    t0 = time.perf_counter()
+    result = {
+        'name': job['name'],
+        'basis': job.get('basis', 'sto3g'),
+        'natoms': len(job['atoms']),
+        'N': basis_size(job),
+        'energy': None,
+        'orbital_energies': None,
+        'homo': None,
+        'lumo': None,
+        'niter': None,
+        'converged': False,
+        'status': None,
+        'error': None,
+    }
+    try:
+        res = calculate(build_geometry(job['atoms'], job['name']), result['basis'], **kwargs)
+        e = res['orbital_energies']
+        nocc = int(sum(n[1] for n in res['nuclei'])) // 2
+        result.update({
+            'energy': res['energy'],
+            'orbital_energies': e,
+            'homo': e[nocc-1] if nocc > 0 else float('nan'),
+            'lumo': e[nocc] if nocc < len(e) else float('nan'),
+            'niter': res['niter'],
+            'converged': res['converged'],
+            'status': res['status'],
+        })
+    except Exception:
+        result['error'] = traceback.format_exc()
+    result['time'] = time.perf_counter() - t0
+
+    return result
+
+def run_batch(jobs, nprocs=None, **kwargs):
+    """
+    Perform the SCF calculations for a list of jobs
+
+    Every job is a dictionary with a name, a list of atoms as (symbol, x, y,
+    z) tuples in Bohr and optionally the name of the basis set (default:
+    'sto3g'). The jobs are distributed over a pool of nprocs processes
+    (None: all available cores), starting with the largest basis sets such
+    that no single expensive job is left running at the end. Failed jobs do
+    not affect the others; their traceback is stored under 'error'. All
+    other keyword arguments are passed on to scf. Returns the results in
+    the order of the jobs.
+    """
+    if nprocs is None:
+        nprocs = os.cpu_count()
+    kwargs.setdefault('verbose', False)
+
+    order = sorted(range(len(jobs)), key=lambda i: basis_size(jobs[i]), reverse=True)
+    results = [None] * len(jobs)
+    if nprocs == 1:
+        for i in order:
+            results[i] = run_job(jobs[i], kwargs)
+    else:
+        with ProcessPoolExecutor(max_workers=nprocs) as executor:
+            futures = {executor.submit(run_job, jobs[i], kwargs): i for i in order}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+    return results
+
+def print_results(results):
+    """
+    Print a table of the total energies, the HOMO and LUMO energies, the
+    number of iterations and the timings of a batch; the errors of the
+    failed jobs are listed below the table
+    """
+    print('%-10s %6s %4s %18s %10s %10s %6s %-11s %9s' %
+          ('Name', 'Basis', 'N', 'Energy [Ht]', 'HOMO', 'LUMO', 'Iter', 'Status', 'Time [s]'))
+    for res in results:
+        if res['error'] is not None:
+            print('%-10s %6s %4i %18s %10s %10s %6s %-11s %9.3f' %
+                  (res['name'], res['basis'], res['N'], 'FAILED', '', '', '', '', res['time']))
+            continue
+        print('%-10s %6s %4i %18.10f %10.4f %10.4f %6i %-11s %9.3f' %
+              (res['name'], res['basis'], res['N'], res['energy'],
+               res['homo'], res['lumo'], res['niter'], res['status'], res['time']))
+
+    for res in results:
+        if res['error'] is not None:
+            print('\nJob %s failed:\n%s' % (res['name'], res['error']))
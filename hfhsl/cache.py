@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import hashlib
+import os
+import shutil
+import tempfile
+import numpy as np
+
+def fingerprint(nuclei, basis, threshold=None):
+    """
+    Build a unique key for a set of nuclei (positions and charges), the
+    name of the basis set and the screening threshold of the integrals
+    """
+    h = hashlib.sha256()
+    h.update(basis.encode('utf8'))
+    h.update(repr(threshold).encode('utf8'))
+    for pos, charge in nuclei:
+        h.update(('%.10f %.10f %.10f %i;' % (pos[0], pos[1], pos[2], charge)).encode('utf8'))
+
+    return h.hexdigest()
+
+class IntegralCache:
+    """
+    On-disk cache of the overlap, kinetic, nuclear attraction and
+    two-electron integrals
+
+    Every entry is a directory holding one .npy file per matrix. The
+    two-electron integrals are opened as a read-only memory map such that
+    these are only read into memory when needed. When the total size of
+    the cache exceeds max_bytes, the least recently used entries are
+    removed.
+    """
+    def __init__(self, path=None, max_bytes=1024**3):
+        if path is None:
+            path = os.environ.get('HFHSL_CACHE',
+                                  os.path.join(os.path.expanduser('~'), '.cache', 'hfhsl'))
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(self.path, exist_ok=True)
+
+    def load(self, nuclei, basis, threshold=None):
+        """
+        Return the tuple (S, T, V, teint) for this geometry and basis set or
+        None when these are not cached
+        """
+        entry = os.path.join(self.path, fingerprint(nuclei, basis, threshold))
+        if not os.path.isdir(entry):
+            return None
+
+        # mark the entry as recently used
+        os.utime(entry)
+
+        S = np.load(os.path.join(entry, 'S.npy'))
+        T = np.load(os.path.join(entry, 'T.npy'))
+        V = np.load(os.path.join(entry, 'V.npy'))
+        teint = np.load(os.path.join(entry, 'teint.npy'), mmap_mode='r')
+
+        return S, T, V, teint
+
+    def store(self, nuclei, basis, S, T, V, teint, threshold=None):
+        """
+        Store the integrals for this geometry and basis set in the cache
+        """
+        entry = os.path.join(self.path, fingerprint(nuclei, basis, threshold))
+        if os.path.isdir(entry):
+            return
+
+        # write to a temporary directory first such that other processes
+        # never encounter a partially written entry
+        tmpdir = tempfile.mkdtemp(dir=self.path, prefix='.tmp')
+        for name, arr in zip(['S', 'T', 'V', 'teint'], [S, T, V, teint]):
+            np.save(os.path.join(tmpdir, name + '.npy'), arr)
+        try:
+            os.rename(tmpdir, entry)
+        except OSError:
+            # another process stored the same entry in the meantime
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+        self.evict()
+
+    def entries(self):
+        """
+        Return a list of (last access time, size in bytes, path) for all
+        entries in the cache
+        """
+        result = []
+        for name in os.listdir(self.path):
+            entry = os.path.join(self.path, name)
+            if name.startswith('.') or not os.path.isdir(entry):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+            result.append((os.path.getmtime(entry), size, entry))
+
+        return result
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the total size of
+        the cache no longer exceeds max_bytes
+        """
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        while entries and total > self.max_bytes:
+            _, size, entry = entries.pop(0)
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """
+        Remove all entries from the cache
+        """
+        for _, _, entry in self.entries():
+            shutil.rmtree(entry, ignore_errors=True)
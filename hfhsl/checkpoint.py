@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import tempfile
+import numpy as np
+from .cache import fingerprint
+from .guess import project_density
+
+def write_checkpoint(path, nuclei, basis, niter, energies, C, P, F, e,
+                     accelerator=None, converged=False, etol=None, ptol=None,
+                     strategy=None):
+    """
+    Store the state of the SCF procedure after iteration niter: the
+    coefficient, density and Fock matrices, the orbital energies, the
+    energies of all iterations so far and the history of the DIIS
+    accelerator (if any), together with the fingerprint of the geometry
+    and basis set, the convergence criteria etol and ptol and the strategy
+    used for the two-electron integrals
+    """
+    N = len(C)
+    if accelerator is not None:
+        diis_niter = accelerator.niter
+        focks = np.array(accelerator.focks).reshape(-1,N,N)
+        errors = np.array(accelerator.errors).reshape(-1,N,N)
+    else:
+        diis_niter = 0
+        focks = errors = np.zeros((0,N,N))
+
+    # write to a temporary file first such that an interruption never
+    # leaves a partially written checkpoint behind
+    fd, tmpfile = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                   prefix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        np.savez(f, fingerprint=fingerprint(nuclei, basis), niter=niter,
+                 energies=np.array(energies), C=C, P=P, F=F, orbital_energies=e,
+                 converged=converged, diis_niter=diis_niter, diis_focks=focks,
+                 diis_errors=errors, etol=np.nan if etol is None else etol,
+                 ptol=np.nan if ptol is None else ptol, strategy=str(strategy))
+    os.replace(tmpfile, path)
+
+def read_checkpoint(path):
+    """
+    Read a checkpoint written by write_checkpoint; returns a dictionary
+    or None when the file does not exist
+    """
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path) as data:
+        ckpt = {key: data[key] for key in data.files}
+    ckpt['fingerprint'] = str(ckpt['fingerprint'])
+    ckpt['niter'] = int(ckpt['niter'])
+    ckpt['converged'] = bool(ckpt['converged'])
+    ckpt['energies'] = list(ckpt['energies'])
+    ckpt['strategy'] = str(ckpt['strategy'])
+    for key in ('etol', 'ptol'):
+        ckpt[key] = None if np.isnan(ckpt[key]) else float(ckpt[key])
+
+    return ckpt
+
+def tighter(ckpt, etol, ptol):
+    """
+    Whether the convergence criteria of a checkpoint are at least as tight
+    as etol and ptol (None: the density matrix is not checked)
+    """
+    if etol is not None and (ckpt['etol'] is None or ckpt['etol'] > etol):
+        return False
+    if ptol is not None and (ckpt['ptol'] is None or ckpt['ptol'] > ptol):
+        return False
+
+    return True
+
+def resume(path, nuclei, basis, P, S, X, nocc, accelerator=None, strategy=None):
+    """
+    Obtain the density matrix, the first iteration and the list of previous
+    energies to start the SCF procedure from
+
+    When the checkpoint belongs to the same geometry, basis set and strategy,
+    the calculation continues where it stopped, including the DIIS history.
+    When it belongs to another geometry or strategy with the same number of
+    basis functions, its density matrix is projected onto the overlap matrix
+    S (with orthogonalization matrix X) and used as the initial guess with
+    nocc occupied orbitals. Otherwise, or when there is no checkpoint, the
+    SCF starts from P.
+    """
+    ckpt = read_checkpoint(path)
+    if ckpt is None or ckpt['P'].shape != P.shape:
+        return P, 0, []
+
+    if ckpt['fingerprint'] != fingerprint(nuclei, basis) or \
+            ckpt['strategy'] != str(strategy):
+        return project_density(ckpt['P'], S, X, nocc), 0, []
+
+    if accelerator is not None:
+        accelerator.niter = int(ckpt['diis_niter'])
+        accelerator.focks = list(ckpt['diis_focks'])
+        accelerator.errors = list(ckpt['diis_errors'])
+
+    return ckpt['P'], ckpt['niter'] + 1, ckpt['energies']
+
+def finished(path, nuclei, basis, maxiter, etol=None, ptol=None, strategy=None):
+    """
+    Obtain the checkpoint of a finished calculation of this geometry, basis
+    set and strategy, i.e. one that converged with criteria at least as
+    tight as etol and ptol or reached the last iteration (maxiter - 1);
+    returns None when the calculation has to continue
+    """
+    ckpt = read_checkpoint(path)
+    if ckpt is None or ckpt['fingerprint'] != fingerprint(nuclei, basis) or \
+            ckpt['strategy'] != str(strategy):
+        return None
+
+    if (ckpt['converged'] and tighter(ckpt, etol, ptol)) or ckpt['niter'] + 1 >= maxiter:
+        return ckpt
+
+    return None
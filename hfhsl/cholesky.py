@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from pyqint import PyQInt
+import numpy as np
+from .fock import build_g_factorized
+
+def cholesky_vectors(cgfs, tolerance=1e-6, integrator=None):
+    """
+    Perform a pivoted incomplete Cholesky decomposition of the two-electron
+    integrals, regarded as a matrix M[ij,kl] = (ij|kl) over the pairs i>=j
+
+    Only the diagonal (ij|ij) and the columns of the selected pivots are
+    evaluated, skipping the rows that are already represented to within
+    tolerance. The decomposition stops once the largest remaining diagonal
+    element falls below tolerance, which bounds the error of every
+    integral. Returns the M Cholesky vectors as an array of shape (npair,M)
+    over the pairs i>=j in the order of np.tril_indices and the number of
+    evaluated integrals.
+    """
+    if integrator is None:
+        integrator = PyQInt()
+    N = len(cgfs)
+    pi, pj = np.tril_indices(N)
+    npair = len(pi)
+
+    def column(p, rows):
+        return np.array([integrator.repulsion(cgfs[pi[kl]], cgfs[pj[kl]], cgfs[pi[p]], cgfs[pj[p]])
+                         for kl in rows])
+
+    D = np.array([integrator.repulsion(cgfs[pi[kl]], cgfs[pj[kl]], cgfs[pi[kl]], cgfs[pj[kl]])
+                  for kl in range(npair)])
+    nevaluated = npair
+
+    # the number of vectors is at most the number of pairs
+    L = np.empty((npair, npair))
+    M = 0
+    while M < npair:
+        p = np.argmax(D)
+        if D[p] < tolerance:
+            break
+
+        # new Cholesky vector from the column of the pivot, orthogonalized
+        # against all previous vectors; rows of previous pivots are fully
+        # represented (zero diagonal) and rows whose remaining diagonal
+        # lies below tolerance^2 / D[p] change by less than tolerance
+        # (Cauchy-Schwarz), such that neither is evaluated; the element of
+        # the pivot itself follows from the diagonal
+        rows = np.flatnonzero(D > tolerance**2 / D[p])
+        rows = rows[rows != p]
+        v = np.zeros(npair)
+        v[rows] = (column(p, rows) - L[rows,:M].dot(L[p,:M])) / np.sqrt(D[p])
+        v[p] = np.sqrt(D[p])
+        nevaluated += len(rows)
+        L[:,M] = v
+        M += 1
+
+        # update the diagonal of the remaining error matrix
+        D = np.maximum(D - v**2, 0.0)
+        D[p] = 0.0
+
+    return L[:,:M].copy(), nevaluated
+
+class CholeskyFock:
+    """
+    Build G from a Cholesky decomposition of the two-electron integrals,
+    (ij|kl) ~ sum_Q L[ij,Q] * L[kl,Q]; in contrast to density fitting,
+    no auxiliary basis is required and the error is controlled by a
+    single tolerance. The vectors are stored for the pairs i>=j only.
+    """
+    def __init__(self, cgfs, tolerance=1e-6):
+        self.L, self.nevaluated = cholesky_vectors(cgfs, tolerance)
+
+    def build_g(self, P, difference=False):
+        """
+        Build G for the (difference) density matrix P; returns G and the
+        number of skipped quartets
+        """
+        return build_g_factorized(P, self.L), 0
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import numpy as np
+
+def rms(A):
+    """
+    Root mean square of the elements of A
+    """
+    return np.sqrt(np.mean(A * A))
+
+def level_shift(F, S, P, shift):
+    """
+    Raise the energies of the virtual orbitals of P by shift (in Ht)
+
+    The projector onto the occupied orbitals in the non-orthogonal basis
+    is SPS/2 for a closed-shell density matrix, such that adding
+    shift * (S - SPS/2) to F leaves the occupied orbitals unaffected
+    whereas the virtual orbitals are shifted upwards. This increases the
+    gap between the occupied and virtual orbitals and thereby dampens
+    the mixing of these orbitals between two iterations.
+    """
+    SP = S.dot(P)
+
+    return F + shift * (S - 0.5 * SP.dot(S))
+
+class ConvergenceControl:
+    """
+    Convergence criteria and stabilization of the SCF iterations
+
+    An iteration is converged when the change in the energy lies below etol
+    and the root mean square change of the density matrix lies below ptol.
+    When the energy oscillates, i.e. the energy differences of the last
+    window iterations alternate in sign without decreasing in magnitude,
+    the iterations are stabilized (when auto is set) by mixing a fraction
+    damping of the previous density matrix into the new one and by raising
+    the energies of the virtual orbitals by level_shift Ht. Both can also be
+    set from the start. When the energy keeps oscillating, both are raised
+    further along the ladder of settings. The iterations are aborted when
+    the energy oscillates at the top of this ladder, when it diverges or
+    when the smallest energy change has not improved during patience
+    iterations.
+    """
+    # successive damping factors and level shifts (in Ht) of the stabilization
+    ladder = ((0.5, 0.5), (0.7, 1.0), (0.9, 2.0))
+
+    def __init__(self, etol=1e-5, ptol=1e-4, damping=0.0, level_shift=0.0,
+                 auto=True, window=4, patience=20):
+        self.etol = etol
+        self.ptol = ptol
+        self.damping = damping
+        self.level_shift = level_shift
+        self.auto = auto
+        self.window = window
+        self.patience = patience
+        self.stabilized = damping > 0.0 or level_shift > 0.0
+        self.history = []       # energy differences since the last change
+        self.best = np.inf      # smallest energy difference so far
+        self.since_best = 0     # number of iterations since the smallest difference
+        self.delta_rms = None   # root mean square change of the density matrix
+
+    def shift(self, F, S, P):
+        """
+        Return F with the virtual orbitals of P raised by the level shift
+        """
+        if self.level_shift > 0.0:
+            return level_shift(F, S, P, self.level_shift)
+
+        return F
+
+    def damp(self, P, Pprev):
+        """
+        Mix the previous density matrix into P (in place)
+        """
+        if self.damping > 0.0:
+            P *= 1.0 - self.damping
+            P += self.damping * Pprev
+
+        return P
+
+    def oscillating(self):
+        """
+        Check whether the energy differences of the last window iterations
+        alternate in sign without decreasing in magnitude
+        """
+        if len(self.history) < self.window:
+            return False
+        d = np.array(self.history[-self.window:])
+
+        return bool(np.all(d[1:] * d[:-1] < 0) and np.abs(d[-1]) >= 0.5 * np.abs(d[0]))
+
+    def update(self, niter, energies, P, Pprev):
+        """
+        Assess the iteration yielding the last of the energies and the
+        density matrix P from the density matrix Pprev; returns 'converged', the reason
+        to abort ('diverged', 'oscillating' or 'stalled') or None to
+        continue. Switches on damping and level shifting when required.
+        """
+        self.delta_rms = rms(P - Pprev)
+        if not np.isfinite(energies[-1]):
+            return 'diverged'
+        if len(energies) < 2:
+            return None
+
+        dE = energies[-1] - energies[-2]
+        if niter > 1 and np.abs(dE) < self.etol and \
+                (self.ptol is None or self.delta_rms < self.ptol):
+            return 'converged'
+
+        self.history.append(dE)
+        if np.abs(dE) < self.best:
+            self.best = np.abs(dE)
+            self.since_best = 0
+        else:
+            self.since_best += 1
+            if self.patience is not None and self.since_best >= self.patience:
+                return 'stalled'
+
+        if self.oscillating() and not (self.auto and self.stabilize()):
+            return 'oscillating'
+
+        return None
+
+    def stabilize(self):
+        """
+        Raise the damping and level shift to the next step of the ladder
+        of settings; returns False when these already reached its top
+        """
+        for damping, level_shift in self.ladder:
+            if self.damping < damping or self.level_shift < level_shift:
+                break
+        else:
+            return False
+        self.damping = max(self.damping, damping)
+        self.level_shift = max(self.level_shift, level_shift)
+        self.stabilized = True
+        self.history = []
+        self.best = np.inf
+        self.since_best = 0
+
+        return True
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import numpy as np
+
+class DIIS:
+    """
+    Pulay's direct inversion in the iterative subspace (DIIS)
+
+    Every SCF iteration, the Fock matrix F built from the density matrix P
+    is stored together with its error vector FPS - SPF, which vanishes
+    at convergence. The Fock matrix used for the diagonalization is then
+    replaced by the linear combination of the stored Fock matrices that
+    minimizes the norm of the combined error vector.
+    """
+    def __init__(self, size=6, start=1):
+        self.size = size        # maximum number of stored Fock matrices
+        self.start = start      # iteration from which DIIS is used
+        self.niter = 0
+        self.focks = []
+        self.errors = []
+
+    def extrapolate(self, F, P, S):
+        """
+        Store F and its error vector and return the extrapolated Fock matrix
+        """
+        self.niter += 1
+        if self.niter <= self.start:
+            return F
+
+        # F may be a buffer that is overwritten in the next iteration
+        FPS = F.dot(P).dot(S)
+        self.focks.append(F.copy())
+        self.errors.append(FPS - FPS.transpose())
+        if len(self.focks) > self.size:
+            self.focks.pop(0)
+            self.errors.pop(0)
+
+        while len(self.focks) > 1:
+            try:
+                c = self.coefficients()
+                break
+            except np.linalg.LinAlgError:
+                # the subspace has become (numerically) linearly dependent,
+                # discard the oldest vector
+                self.focks.pop(0)
+                self.errors.pop(0)
+        else:
+            return F
+
+        return np.einsum('i,ijk->jk', c, np.array(self.focks))
+
+    def reset(self):
+        """
+        Discard the stored Fock matrices and restart the count of iterations
+        """
+        self.niter = 0
+        self.focks = []
+        self.errors = []
+
+    def coefficients(self):
+        """
+        Solve the DIIS equations for the expansion coefficients
+        """
+        n = len(self.errors)
+        B = -np.ones((n+1, n+1))
+        B[n,n] = 0.0
+        for i in range(n):
+            for j in range(i+1):
+                B[i,j] = B[j,i] = np.sum(self.errors[i] * self.errors[j])
+        rhs = np.zeros(n+1)
+        rhs[n] = -1.0
+
+        return np.linalg.solve(B, rhs)[:n]
+
+    def error(self):
+        """
+        Largest element of the most recent error vector
+        """
+        return np.max(np.abs(self.errors[-1])) if self.errors else np.inf
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from pyqint import PyQInt
+import numpy as np
+from .eri import schwarz_bounds
+from .fock import contract_quartets
+
+def build_g_direct(cgfs, P, Q, threshold=None, integrator=None):
+    """
+    Build G from the density matrix P by evaluating the two-electron
+    integrals on the fly, such that these never have to be stored
+
+    The canonical quartets are processed one pair ij at a time, keeping
+    the memory footprint at O(N^2). Quartets for which Q[i,j] * Q[k,l]
+    times the largest element of P falls below threshold are skipped.
+    Returns G and the number of evaluated and skipped integrals.
+    """
+    if integrator is None:
+        integrator = PyQInt()
+    N = len(cgfs)
+    J = np.zeros((N,N))
+    K = np.zeros((N,N))
+    pmax = np.max(np.abs(P))
+    if pmax == 0.0:
+        return np.zeros((N,N)), 0, 0
+    pi, pj = np.tril_indices(N)
+    qpair = Q[pi, pj]
+
+    nevaluated = 0
+    nskipped = 0
+    for ij in range(len(pi)):
+        # all pairs kl <= ij that survive the screening
+        kl = np.arange(ij+1)
+        if threshold is not None:
+            mask = qpair[ij] * qpair[:ij+1] * pmax >= threshold
+            nskipped += ij + 1 - np.count_nonzero(mask)
+            kl = kl[mask]
+        if len(kl) == 0:
+            continue
+
+        i = np.full(len(kl), pi[ij])
+        j = np.full(len(kl), pj[ij])
+        k, l = pi[kl], pj[kl]
+        values = np.array([integrator.repulsion(cgfs[pi[ij]], cgfs[pj[ij]], cgfs[kk], cgfs[ll])
+                           for kk,ll in zip(k,l)])
+        nevaluated += len(values)
+
+        contract_quartets(J, K, P, (i, j, k, l), values)
+
+    return J - 0.5 * K, nevaluated, nskipped
+
+class DirectFock:
+    """
+    Build G by recomputing the two-electron integrals in every iteration
+    (integral-direct SCF); only the Cauchy-Schwarz bounds are stored such
+    that the memory footprint scales as O(N^2). The number of evaluated
+    integrals includes the N(N+1)/2 integrals (ij|ij) of these bounds.
+    """
+    def __init__(self, cgfs, threshold=None):
+        self.cgfs = cgfs
+        self.Q = schwarz_bounds(cgfs)
+        self.threshold = threshold
+        self.integrator = PyQInt()
+        self.nevaluated = len(cgfs) * (len(cgfs) + 1) // 2
+
+    def build_g(self, P, difference=False):
+        """
+        Build G for the (difference) density matrix P; returns G and the
+        number of skipped integrals
+        """
+        G, nevaluated, nskipped = build_g_direct(self.cgfs, P, self.Q, self.threshold,
+                                                 self.integrator)
+        self.nevaluated += nevaluated
+
+        return G, nskipped
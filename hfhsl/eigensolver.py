@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import warnings
+import numpy as np
+import scipy.linalg
+from scipy.sparse.linalg import lobpcg
+
+METHODS = ('auto', 'full', 'subset', 'lobpcg')
+
+# the lowest k eigenpairs of a dense symmetric N x N matrix are obtained
+# faster than the full spectrum once k/N drops below CROSSOVER, nearly
+# independently of N; below MIN_SIZE the difference is immaterial (see
+# benchmarks/eigensolver.py)
+CROSSOVER = 0.15
+MIN_SIZE = 30
+
+def select_method(N, k, crossover=CROSSOVER):
+    """
+    Select whether the full spectrum ('full') or only the lowest k
+    eigenpairs ('subset') of an N x N matrix are calculated
+    """
+    if N >= MIN_SIZE and k < crossover * N:
+        return 'subset'
+
+    return 'full'
+
+class Eigensolver:
+    """
+    Diagonalization of the transformed Fock matrix
+
+    Only the lowest k eigenpairs are needed to construct the density
+    matrix. These are calculated either together with all other eigenpairs
+    ('full'), directly by LAPACK ('subset') or iteratively by LOBPCG
+    starting from the eigenvectors of the previous call ('lobpcg'). The
+    latter pays off when the matrix barely changes between two calls and
+    matrix-vector products are cheap. By default ('auto'), the method is
+    chosen from the size of the matrix and the fraction of eigenpairs.
+    """
+    def __init__(self, k, method='auto', tol=1e-9, maxiter=100):
+        if method not in METHODS:
+            raise ValueError('Unknown eigensolver: %s' % method)
+        self.k = k
+        self.method = method
+        self.tol = tol
+        self.maxiter = maxiter
+        self.vectors = None
+
+    def solve(self, A):
+        """
+        Return the eigenvalues in ascending order and the eigenvectors of A;
+        depending on the method, only the lowest k are returned
+        """
+        N = A.shape[0]
+        method = select_method(N, self.k) if self.method == 'auto' else self.method
+
+        if method == 'full' or self.k >= N:
+            e, V = np.linalg.eigh(A)
+        elif method == 'lobpcg' and self.vectors is not None:
+            with warnings.catch_warnings():
+                # LOBPCG warns when the tolerance is not reached within
+                # maxiter iterations; the SCF procedure corrects for this
+                warnings.simplefilter('ignore')
+                e, V = lobpcg(A, self.vectors, largest=False, tol=self.tol,
+                              maxiter=self.maxiter)
+            order = np.argsort(e)
+            e, V = e[order], V[:,order]
+        else:
+            # the first call of LOBPCG lacks a starting subspace
+            e, V = scipy.linalg.eigh(A, subset_by_index=[0, self.k-1], driver='evr',
+                                     check_finite=False)
+        self.vectors = V[:,:self.k]
+
+        return e, V
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+from pyqint import PyQInt
+import numpy as np
+from .teindex import canonical_quartet_rows, teint_size
+
+# basis set, integrator and screening settings of a worker process, set
+# by _init_worker
+_worker_cgfs = None
+_worker_integrator = None
+_worker_Q = None
+_worker_threshold = None
+_worker_mask = None
+
+def _init_worker(cgfs, Q=None, threshold=None, mask=None):
+    """
+    Store the basis set in the worker process such that it is only
+    transferred once rather than once per chunk
+    """
+    global _worker_cgfs, _worker_integrator, _worker_Q, _worker_threshold, _worker_mask
+    _worker_cgfs = cgfs
+    _worker_integrator = PyQInt()
+    _worker_Q = Q
+    _worker_threshold = threshold
+    _worker_mask = mask
+
+def _evaluate_rows(start, stop):
+    """
+    Evaluate the two-electron integrals for all canonical quartets of the
+    pairs ij in [start,stop); returns the values for the consecutive teint
+    indices of these quartets (zero for screened quartets), the number of
+    skipped quartets, the process id and the wall time spent
+    """
+    t0 = time.perf_counter()
+    cgfs = _worker_cgfs
+    quartets, idx = canonical_quartet_rows(len(cgfs), start, stop)
+    values = np.zeros(len(quartets))
+
+    # discard all quartets that are guaranteed to be negligible or that
+    # are excluded by the caller
+    mask = np.ones(len(quartets), dtype=bool)
+    if _worker_threshold is not None:
+        mask = screen_quartets(quartets, _worker_Q, _worker_threshold)
+    if _worker_mask is not None:
+        mask &= _worker_mask[idx]
+    for n in np.flatnonzero(mask):
+        i, j, k, l = quartets[n]
+        values[n] = _worker_integrator.repulsion(cgfs[i], cgfs[j], cgfs[k], cgfs[l])
+
+    return values, len(mask) - np.count_nonzero(mask), os.getpid(), time.perf_counter() - t0
+
+def _row_chunks(npair, nchunks):
+    """
+    Split the pairs [0,npair) into at most nchunks consecutive ranges holding
+    roughly the same number of quartets
+    """
+    # row r holds r+1 quartets and starts at index r*(r+1)/2
+    rows = np.arange(npair + 1)
+    offsets = rows * (rows + 1) // 2
+    targets = np.linspace(0, offsets[-1], nchunks + 1)
+    bounds = np.unique(np.searchsorted(offsets, targets))
+
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def schwarz_bounds(cgfs):
+    """
+    Calculate the Cauchy-Schwarz bounds Q[i,j] = sqrt((ij|ij)) for all
+    pairs of basis functions such that |(ij|kl)| <= Q[i,j] * Q[k,l]
+    """
+    integrator = PyQInt()
+    N = len(cgfs)
+    Q = np.zeros((N,N))
+    for i in range(N):
+        for j in range(i+1):
+            Q[i,j] = Q[j,i] = np.sqrt(abs(integrator.repulsion(cgfs[i], cgfs[j], cgfs[i], cgfs[j])))
+
+    return Q
+
+def screen_quartets(quartets, Q, threshold):
+    """
+    Return a boolean mask of the quartets whose Cauchy-Schwarz bound
+    Q[i,j] * Q[k,l] is at least threshold
+    """
+    i, j, k, l = quartets.T
+
+    return Q[i,j] * Q[k,l] >= threshold
+
+def build_teint(cgfs, nprocs=1, nchunks=None, threshold=None, out=None, mask=None):
+    """
+    Calculate all unique two-electron integrals and store these in the
+    teint array as used by the exercise scripts
+
+    The quartets are distributed in chunks over nprocs worker processes;
+    nprocs=None uses all available cores and nprocs=1 evaluates all
+    integrals in the current process. When a threshold is given, all
+    integrals whose Cauchy-Schwarz bound lies below the threshold are
+    skipped and set to zero, as are all integrals for which the boolean
+    array mask (when given) is False. The integrals are written to out
+    (e.g. a memory-mapped array) when given. Returns teint and a dictionary with
+    timing statistics per worker.
+    """
+    start = time.perf_counter()
+    N = len(cgfs)
+    Q = schwarz_bounds(cgfs) if threshold is not None else None
+
+    if nprocs is None:
+        nprocs = os.cpu_count()
+
+    # use a couple of chunks per worker such that workers which happen
+    # to receive cheap integrals can pick up more work
+    if nchunks is None:
+        nchunks = 1 if nprocs == 1 else 4 * nprocs
+    chunks = _row_chunks(N * (N + 1) // 2, nchunks)
+
+    teint = np.zeros(teint_size(N)) if out is None else out
+    workers = {}
+    counts = {'integrals': 0, 'skipped': 0}
+    def collect(chunk, values, nskipped, pid, walltime):
+        teint[chunk[0] * (chunk[0] + 1) // 2:chunk[1] * (chunk[1] + 1) // 2] = values
+        counts['integrals'] += len(values) - nskipped
+        counts['skipped'] += nskipped
+        stats = workers.setdefault(pid, {'chunks': 0, 'integrals': 0, 'time': 0.0})
+        stats['chunks'] += 1
+        stats['integrals'] += len(values) - nskipped
+        stats['time'] += walltime
+
+    if nprocs == 1:
+        _init_worker(cgfs, Q, threshold, mask)
+        for chunk in chunks:
+            collect(chunk, *_evaluate_rows(*chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=nprocs, initializer=_init_worker,
+                                 initargs=(cgfs, Q, threshold, mask)) as executor:
+            futures = [(chunk, executor.submit(_evaluate_rows, *chunk)) for chunk in chunks]
+            for chunk, future in futures:
+                collect(chunk, *future.result())
+
+    stats = {
+        'nprocs': nprocs,
+        'integrals': counts['integrals'],
+        'skipped': counts['skipped'],
+        'time': time.perf_counter() - start,
+        'workers': workers,
+    }
+
+    return teint, stats
+
+def print_stats(stats):
+    """
+    Print the timing statistics of build_teint per worker process
+    """
+    print('Evaluated %i two-electron integrals on %i process(es) in %.3f s' %
+          (stats['integrals'], stats['nprocs'], stats['time']))
+    if stats['skipped'] > 0:
+        print('Skipped %i negligible or symmetry-equivalent two-electron integrals' %
+              stats['skipped'])
+    for pid, worker in sorted(stats['workers'].items()):
+        print('    Worker %i: %i chunks, %i integrals, %.3f s' %
+              (pid, worker['chunks'], worker['integrals'], worker['time']))
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import numpy as np
+from .teindex import index_map, canonical_quartet_rows
+
+def unpack_teint(teint, N):
+    """
+    Unpack the list of unique two-electron integrals into a four-index
+    array such that eri[i,j,k,l] = (ij|kl)
+    """
+    return teint[index_map(N).rep]
+
+def build_jk(P, eri):
+    """
+    Build the Coulomb (J) and exchange (K) matrices from the density
+    matrix P and the unpacked two-electron integrals
+    """
+    # J[i,j] = sum_kl P[k,l] * (ij|lk)
+    J = np.einsum('kl,ijlk->ij', P, eri, optimize=True)
+
+    # K[i,j] = sum_kl P[k,l] * (ik|lj)
+    K = np.einsum('kl,iklj->ij', P, eri, optimize=True)
+
+    return J, K
+
+def build_g(P, eri):
+    """
+    Build the two-electron part G of the Fock matrix from the density
+    matrix P; this yields the same result as the quadruple loop over
+    teint in the exercise scripts
+    """
+    J, K = build_jk(P, eri)
+
+    return J - 0.5 * K
+
+def schwarz_from_eri(eri):
+    """
+    Extract the Cauchy-Schwarz bounds Q[i,j] = sqrt((ij|ij)) from the
+    unpacked two-electron integrals
+    """
+    N = eri.shape[0]
+    i, j = np.indices((N,N))
+
+    return np.sqrt(np.abs(eri[i,j,i,j]))
+
+def build_g_screened(P, eri, Q, threshold):
+    """
+    Build G while skipping all density matrix elements P[k,l] for which
+    every (ij|kl) and (ik|lj) contribution is guaranteed to be smaller than
+    threshold; this is particularly effective for difference densities in
+    incremental Fock builds. Returns G and the number of skipped quartets.
+    """
+    # |(ij|kl)| <= Q[i,j] * Q[k,l] and |(ik|lj)| <= Q[i,k] * Q[l,j], such that
+    # the largest contribution of P[k,l] is bounded by |P[k,l]| times the
+    # largest of max(Q) * Q[k,l] and max_i(Q[i,k]) * max_j(Q[l,j])
+    N = P.shape[0]
+    qmax = Q.max(axis=0)
+    bound = np.abs(P) * np.maximum(Q.max() * Q, np.outer(qmax, qmax))
+    k, l = np.nonzero(bound >= threshold)
+
+    # J[i,j] = sum_kl P[k,l] * (ij|kl) and K[i,j] = sum_kl P[k,l] * (ik|lj)
+    J = np.einsum('ijn,n->ij', eri[:,:,k,l], P[k,l], optimize=True)
+    K = np.einsum('inj,n->ij', eri[:,k,l,:], P[k,l], optimize=True)
+
+    return J - 0.5 * K, (N * N - len(k)) * N * N
+
+def build_g_factorized(P, L, blocksize=64):
+    """
+    Build G from a factorization of the two-electron integrals of the form
+    (ij|kl) = sum_Q L[ij,Q] * L[kl,Q], as obtained by density fitting or a
+    Cholesky decomposition, wherein the rows of L run over the pairs i>=j
+    in the order of np.tril_indices; only blocksize vectors at a time are
+    unpacked to full (N,N) matrices for the exchange contribution
+    """
+    N = P.shape[0]
+    pi, pj = np.tril_indices(N)
+
+    # J[i,j] = sum_Q L[ij,Q] sum_kl L[kl,Q] P[k,l]; the off-diagonal pairs
+    # kl stand for both P[k,l] and P[l,k]
+    Jpacked = L.dot(L.transpose().dot(np.where(pi == pj, 1.0, 2.0) * P[pi,pj]))
+    J = np.zeros((N,N))
+    J[pi,pj] = J[pj,pi] = Jpacked
+
+    # K[i,j] = sum_Q sum_kl B[Q,i,k] P[k,l] B[Q,l,j] with B[Q] the unpacked
+    # vector Q
+    K = np.zeros((N,N))
+    for start in range(0, L.shape[1], blocksize):
+        Lb = L[:,start:start+blocksize].transpose()
+        B = np.zeros((len(Lb), N, N))
+        B[:,pi,pj] = B[:,pj,pi] = Lb
+        K += np.tensordot(np.matmul(B, P), B, axes=([0,2], [0,1]))
+
+    return J - 0.5 * K
+
+def contract_quartets(J, K, P, quartets, values):
+    """
+    Add the contributions of a set of canonical two-electron integrals to
+    the Coulomb and exchange matrices J and K; quartets holds the four
+    index arrays (i,j,k,l) and values the corresponding integrals
+    """
+    i, j, k, l = quartets
+
+    # every distinct permutation occurs 8/deg times among the eight
+    # permutations below, with deg the number of distinct permutations;
+    # weigh each of them with deg/8 to count it exactly once
+    deg = np.where(i == j, 1, 2) * np.where(k == l, 1, 2) * \
+          np.where((i == k) & (j == l), 1, 2)
+    w = values * deg / 8.0
+    for p, q, r, s in [(i, j, k, l), (j, i, k, l), (i, j, l, k), (j, i, l, k),
+                       (k, l, i, j), (l, k, i, j), (k, l, j, i), (l, k, j, i)]:
+        # J[p,q] += (pq|rs) * P[r,s] and K[p,s] += (pq|rs) * P[q,r]
+        np.add.at(J, (p, q), w * P[r, s])
+        np.add.at(K, (p, s), w * P[q, r])
+
+class InCoreFock:
+    """
+    Build G from the two-electron integrals which are held in memory
+
+    When a threshold is given, difference densities are screened using
+    build_g_screened.
+    """
+    def __init__(self, teint, N, threshold=None):
+        self.eri = unpack_teint(teint, N)
+        self.Q = schwarz_from_eri(self.eri)
+        self.threshold = threshold
+
+    def build_g(self, P, difference=False):
+        """
+        Build G for the (difference) density matrix P; returns G and the
+        number of skipped quartets
+        """
+        if difference and self.threshold is not None:
+            return build_g_screened(P, self.eri, self.Q, self.threshold)
+
+        return build_g(P, self.eri), 0
+
+class PackedFock:
+    """
+    Build G directly from the packed teint array without unpacking it
+
+    The array is processed in blocks of consecutive pairs ij, such that
+    teint can be a memory-mapped array on disk of which only a single
+    block is read into memory at any time.
+    """
+    def __init__(self, teint, N, blocksize=2**20):
+        self.teint = teint
+        self.N = N
+        self.blocksize = blocksize
+
+    def build_g(self, P, difference=False):
+        """
+        Build G for the (difference) density matrix P; returns G and the
+        number of skipped quartets
+        """
+        N = self.N
+        J = np.zeros((N,N))
+        K = np.zeros((N,N))
+        # pair ij holds ij+1 quartets which start at index ij*(ij+1)/2
+        npair = N * (N + 1) // 2
+        offsets = np.arange(npair + 1) * np.arange(1, npair + 2) // 2
+        start = 0
+        while start < npair:
+            # take as many pairs as fit in a block of integrals
+            stop = np.searchsorted(offsets, offsets[start] + self.blocksize, side='right') - 1
+            stop = min(max(stop, start + 1), npair)
+            quartets, idx = canonical_quartet_rows(N, start, stop)
+            values = np.asarray(self.teint[idx[0]:idx[-1]+1])
+            contract_quartets(J, K, P, quartets.T, values)
+            start = stop
+
+        return J - 0.5 * K, 0
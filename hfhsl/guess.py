@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from functools import lru_cache
+from pyqint import Molecule
+import numpy as np
+from .eri import build_teint
+from .fock import InCoreFock
+from .oneelectron import one_electron_matrices
+
+# element symbols ordered by their atomic number, used to set up the atomic
+# calculations of the SAD guess from the nuclear charges
+ELEMENTS = ('H', 'He', 'Li', 'Be', 'B', 'C', 'N', 'O', 'F', 'Ne',
+            'Na', 'Mg', 'Al', 'Si', 'P', 'S', 'Cl', 'Ar')
+
+GUESSES = ('zero', 'core', 'gwh', 'sad')
+
+def density_from_orbitals(H, X, nocc):
+    """
+    Build the density matrix by occupying the nocc lowest eigenvectors of
+    the matrix H in the orthogonalized basis given by X
+    """
+    e, Cprime = np.linalg.eigh(X.transpose().dot(H).dot(X))
+    C = X.dot(Cprime)
+
+    return 2.0 * C[:,:nocc].dot(C[:,:nocc].transpose())
+
+def core_guess(H, X, nocc):
+    """
+    Core Hamiltonian guess: occupy the eigenvectors of H = T + V, i.e. the
+    orbitals in the absence of any electron-electron repulsion
+    """
+    return density_from_orbitals(H, X, nocc)
+
+def gwh_guess(H, S, X, nocc, K=1.75):
+    """
+    Generalized Wolfsberg-Helmholz (extended Hückel) guess, wherein the
+    off-diagonal elements of the core Hamiltonian are replaced by
+    K * S_ij * (H_ii + H_jj) / 2
+    """
+    h = np.diag(H)
+    Hgwh = 0.5 * K * S * (h[:,np.newaxis] + h[np.newaxis,:])
+    np.fill_diagonal(Hgwh, h)
+
+    return density_from_orbitals(Hgwh, X, nocc)
+
+def fractional_occupations(e, nelec, degeneracy=1e-4):
+    """
+    Distribute nelec electrons over the orbitals with energies e (in
+    ascending order); the remaining electrons of an open shell are spread
+    evenly over all (near-)degenerate orbitals of that shell, which keeps
+    the atomic density spherically symmetric
+    """
+    occ = np.zeros(len(e))
+    i = 0
+    remaining = float(nelec)
+    while remaining > 0.0 and i < len(e):
+        shell = np.flatnonzero(np.abs(e[i:] - e[i]) < degeneracy) + i
+        n = min(remaining, 2.0 * len(shell))
+        occ[shell] = n / len(shell)
+        remaining -= n
+        i = shell[-1] + 1
+
+    return occ
+
+@lru_cache(maxsize=None)
+def atomic_density(charge, basis='sto3g', maxiter=100, ptol=1e-8):
+    """
+    Calculate the spherically averaged density matrix of the neutral atom
+    with the given nuclear charge by an SCF calculation with fractional
+    occupations; the result is cached per element and basis set
+    """
+    symbol = ELEMENTS[charge - 1]
+    mol = Molecule(symbol)
+    mol.add_atom(symbol, 0.0, 0.0, 0.0)
+    cgfs, nuclei = mol.build_basis(basis)
+    N = len(cgfs)
+
+    S, T, V = one_electron_matrices(cgfs, nuclei)
+    H = T + V
+    teint, _ = build_teint(cgfs)
+    fock = InCoreFock(teint, N)
+    s, U = np.linalg.eigh(S)
+    X = U.dot(np.diag(1.0/np.sqrt(s)))
+
+    P = np.zeros((N,N))
+    for niter in range(0, maxiter):
+        G, _ = fock.build_g(P)
+        e, Cprime = np.linalg.eigh(X.transpose().dot(H + G).dot(X))
+        C = X.dot(Cprime)
+        Pnew = (C * fractional_occupations(e, charge)).dot(C.transpose())
+        if np.max(np.abs(Pnew - P)) < ptol:
+            P = Pnew
+            break
+        P = Pnew
+
+    P.flags.writeable = False
+    return P
+
+def sad_guess(cgfs, nuclei, basis='sto3g'):
+    """
+    Superposition of atomic densities (SAD) guess: a block-diagonal density
+    matrix assembled from the densities of the isolated atoms. The basis
+    functions are assumed to be ordered per atom, following the order of
+    the nuclei, as is the case for Molecule.build_basis.
+    """
+    blocks = [atomic_density(int(charge), basis) for _, charge in nuclei]
+    if sum(len(b) for b in blocks) != len(cgfs):
+        raise ValueError('The basis functions do not match the atomic basis sets of %s' % basis)
+
+    P = np.zeros((len(cgfs), len(cgfs)))
+    offset = 0
+    for block in blocks:
+        n = len(block)
+        P[offset:offset+n, offset:offset+n] = block
+        offset += n
+
+    return P
+
+def project_density(P, S, X, nocc):
+    """
+    Project a density matrix obtained for another geometry onto the basis
+    set of the current geometry
+
+    The density matrix is transformed into the orthonormal basis given by
+    X, wherein its nocc dominant natural orbitals are orthonormal by
+    construction. These are occupied to build an idempotent density matrix
+    with the correct number of electrons for the overlap matrix S.
+    """
+    SX = S.dot(X)
+    n, V = np.linalg.eigh(SX.transpose().dot(P).dot(SX))
+    C = X.dot(V[:,::-1][:,:nocc])
+
+    return 2.0 * C.dot(C.transpose())
+
+def initial_guess(guess, H, S, X, nocc, cgfs=None, nuclei=None, basis='sto3g'):
+    """
+    Construct the initial density matrix for one of the GUESSES; when guess
+    is a density matrix of a previous calculation, it is projected onto
+    the current basis set
+    """
+    if isinstance(guess, np.ndarray):
+        return project_density(guess, S, X, nocc)
+    elif guess == 'zero':
+        return np.zeros(S.shape)
+    elif guess == 'core':
+        return core_guess(H, X, nocc)
+    elif guess == 'gwh':
+        return gwh_guess(H, S, X, nocc)
+    elif guess == 'sad':
+        return sad_guess(cgfs, nuclei, basis)
+
+    raise ValueError('Unknown initial guess: %s' % guess)
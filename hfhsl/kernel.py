@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import numpy as np
+from .eigensolver import Eigensolver
+
+class SCFKernel:
+    """
+    The steps of an SCF iteration apart from the construction of G
+
+    All matrices are stored in buffers that are allocated once and updated
+    in place every iteration. The density matrix alternates between two
+    buffers such that the density matrix of the previous iteration remains
+    available, e.g. for incremental Fock builds. Note that the returned
+    matrices are overwritten by subsequent calls; copy these when they
+    need to be kept. The diagonalization is delegated to an Eigensolver,
+    which may only yield the occupied orbitals.
+    """
+    def __init__(self, H, X, nocc, enuc=0.0, eigensolver=None):
+        N, M = X.shape
+        self.H = H
+        self.X = X
+        self.nocc = nocc
+        self.enuc = enuc
+        self.eigensolver = eigensolver if eigensolver is not None else Eigensolver(nocc, 'full')
+        self.F = np.empty((N,N))
+        self.M = np.empty((N,N))
+        self.XF = np.empty((M,N))
+        self.Fprime = np.empty((M,M))
+        self.C = np.empty((N,M))
+        self.P = [np.empty((N,N)), np.empty((N,N))]
+        self.current = 1
+
+    def fock(self, G):
+        """
+        Build the Fock matrix F = H + G
+        """
+        return np.add(self.H, G, out=self.F)
+
+    def energy(self, P, F):
+        """
+        Calculate the total energy of density matrix P and Fock matrix F
+        """
+        np.add(self.H, F, out=self.M)
+
+        # P and M are symmetric, such that the trace of PM equals the sum
+        # of their elementwise product
+        return 0.5 * np.vdot(P, self.M) + self.enuc
+
+    def diagonalize(self, F):
+        """
+        Transform F to the orthogonal basis, diagonalize it and transform
+        the eigenvectors back; returns the orbital energies and C
+        """
+        np.dot(self.X.transpose(), F, out=self.XF)
+        np.dot(self.XF, self.X, out=self.Fprime)
+        e, Cprime = self.eigensolver.solve(self.Fprime)
+        if self.C.shape[1] != Cprime.shape[1]:
+            self.C = np.empty((self.X.shape[0], Cprime.shape[1]))
+        np.dot(self.X, Cprime, out=self.C)
+
+        return e, self.C
+
+    def complete(self):
+        """
+        Return all orbital energies and orbitals of the most recently
+        diagonalized Fock matrix
+        """
+        e, Cprime = np.linalg.eigh(self.Fprime)
+
+        return e, self.X.dot(Cprime)
+
+    def density(self, C):
+        """
+        Calculate the density matrix P = 2 Cocc Cocc^T from the occupied
+        orbitals in the columns of C
+        """
+        self.current = 1 - self.current
+        P = self.P[self.current]
+        Cocc = C[:,:self.nocc]
+        np.dot(Cocc, Cocc.transpose(), out=P)
+        P *= 2.0
+
+        return P
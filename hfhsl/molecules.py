@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import numpy as np
+from pyqint import Molecule
+
+# geometries of the molecules used to test and benchmark the package; all
+# coordinates are given in atomic units (Bohr)
+MOLECULES = {
+    'h2': [
+        ('H', 0.0, 0.0, -0.7),
+        ('H', 0.0, 0.0,  0.7),
+    ],
+    'he': [
+        ('He', 0.0, 0.0, 0.0),
+    ],
+    'co': [
+        ('C', 0.0, 0.0, -2.116/2.0),
+        ('O', 0.0, 0.0,  2.116/2.0),
+    ],
+    'ch4': [
+        ('C', 0.0, 0.0, 0.0),
+        ('H',  1.09**(1.0/3.0),  1.09**(1.0/3.0),  1.09**(1.0/3.0)),
+        ('H', -1.09**(1.0/3.0), -1.09**(1.0/3.0),  1.09**(1.0/3.0)),
+        ('H', -1.09**(1.0/3.0),  1.09**(1.0/3.0), -1.09**(1.0/3.0)),
+        ('H',  1.09**(1.0/3.0), -1.09**(1.0/3.0), -1.09**(1.0/3.0)),
+    ],
+    'h2o': [
+        ('O', 0.0,  0.0,    0.0),
+        ('H', 0.0,  1.4305, 1.1072),
+        ('H', 0.0, -1.4305, 1.1072),
+    ],
+    # planar benzene with C-C and C-H bond lengths of 1.39 and 1.09 Angstrom
+    'benzene': [('C', 2.6267 * np.cos(k * np.pi / 3.0), 2.6267 * np.sin(k * np.pi / 3.0), 0.0)
+                for k in range(6)] +
+               [('H', 4.6866 * np.cos(k * np.pi / 3.0), 4.6866 * np.sin(k * np.pi / 3.0), 0.0)
+                for k in range(6)],
+    # linear chain of hydrogen atoms as an example of a spatially extended
+    # molecule for which many two-electron integrals are negligible
+    'h10': [('H', 0.0, 0.0, 1.4 * i) for i in range(10)],
+}
+
+def build_molecule(name):
+    """
+    Build a PyQInt Molecule object for one of the molecules in MOLECULES
+    """
+    mol = Molecule(name.upper())
+    for atom in MOLECULES[name]:
+        mol.add_atom(*atom)
+
+    return mol
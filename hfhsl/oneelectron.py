@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+from pyqint import PyQInt
+import numpy as np
+from .shells import shell_one_electron_matrices
+
+# basis set, nuclei and integrator of a worker process, set by _init_worker
+_worker_cgfs = None
+_worker_nuclei = None
+_worker_integrator = None
+
+def _init_worker(cgfs, nuclei):
+    """
+    Store the basis set and the nuclei in the worker process such that
+    these are only transferred once rather than once per chunk; the
+    integrator is constructed only once per process as this is relatively
+    expensive compared to the one-electron integrals of small molecules
+    """
+    global _worker_cgfs, _worker_nuclei, _worker_integrator
+    _worker_cgfs = cgfs
+    _worker_nuclei = nuclei
+    if _worker_integrator is None:
+        _worker_integrator = PyQInt()
+
+def _evaluate_pairs(pairs):
+    """
+    Evaluate the overlap, kinetic and nuclear attraction integrals of the
+    pairs (i,j); PyQInt evaluates the nuclear attraction for a single
+    nucleus per call, such that these are evaluated one nucleus at a time
+    and returned per nucleus as an array of shape (len(pairs), number of
+    nuclei). The shells method handles all nuclei in the same array
+    operations instead.
+    """
+    cgfs = _worker_cgfs
+    integrator = _worker_integrator
+    s = np.zeros(len(pairs))
+    t = np.zeros(len(pairs))
+    v = np.zeros((len(pairs), len(_worker_nuclei)))
+    for n, (i, j) in enumerate(pairs):
+        s[n] = integrator.overlap(cgfs[i], cgfs[j])
+        t[n] = integrator.kinetic(cgfs[i], cgfs[j])
+        v[n] = [integrator.nuclear(cgfs[i], cgfs[j], pos, charge)
+                for pos, charge in _worker_nuclei]
+
+    return s, t, v
+
+def one_electron_matrices(cgfs, nuclei, nprocs=1, per_nucleus=False, method='pairs'):
+    """
+    Calculate the overlap, kinetic and nuclear attraction matrices
+
+    As these matrices are symmetric, only the integrals for i>=j are
+    evaluated and mirrored onto the other triangle. The pairs are
+    distributed over nprocs worker processes (None: all available cores).
+    When per_nucleus is set, V holds a separate nuclear attraction matrix
+    for every nucleus, i.e. V[k] corresponds to nuclei[k]. With
+    method='shells', the integrals are evaluated per pair of shells using
+    shells.shell_one_electron_matrices rather than by PyQInt, which batches
+    the nuclear attraction integrals over all nuclei.
+    """
+    if method == 'shells':
+        return shell_one_electron_matrices(cgfs, nuclei, per_nucleus=per_nucleus)
+    elif method != 'pairs':
+        raise ValueError('Unknown method for the one-electron integrals: %s' % method)
+
+    N = len(cgfs)
+    pairs = [(i, j) for i in range(N) for j in range(i+1)]
+
+    if nprocs is None:
+        nprocs = os.cpu_count()
+
+    if nprocs == 1:
+        _init_worker(cgfs, nuclei)
+        s, t, v = _evaluate_pairs(pairs)
+    else:
+        chunks = [pairs[k::4*nprocs] for k in range(4*nprocs)]
+        with ProcessPoolExecutor(max_workers=nprocs, initializer=_init_worker,
+                                 initargs=(cgfs, nuclei)) as executor:
+            results = list(executor.map(_evaluate_pairs, chunks))
+        order = np.concatenate([np.arange(k, len(pairs), 4*nprocs) for k in range(4*nprocs)])
+        s = np.zeros(len(pairs))
+        t = np.zeros(len(pairs))
+        v = np.zeros((len(pairs), len(nuclei)))
+        s[order] = np.concatenate([r[0] for r in results])
+        t[order] = np.concatenate([r[1] for r in results])
+        v[order] = np.concatenate([r[2] for r in results])
+
+    # scatter the lower triangle onto both triangles
+    i, j = np.tril_indices(N)
+    S = np.zeros((N,N))
+    T = np.zeros((N,N))
+    V = np.zeros((len(nuclei),N,N))
+    S[i,j] = S[j,i] = s
+    T[i,j] = T[j,i] = t
+    V[:,i,j] = V[:,j,i] = v.transpose()
+
+    if per_nucleus:
+        return S, T, V
+
+    return S, T, np.sum(V, axis=0)
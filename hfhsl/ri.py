@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import numpy as np
+from .fock import build_g_factorized
+from .shells import Shell, build_shells, shell_class, shell_pair_integrals, \
+    _hermite_coefficients, _hermite_integrals, _primitive_norms
+
+def _cartesian_powers(L):
+    """
+    Return all cartesian powers (l,m,n) with l+m+n = L
+    """
+    return [(l, m, L-l-m) for l in range(L, -1, -1) for m in range(L-l, -1, -1)]
+
+def _hermite_indices(L):
+    """
+    Return all Hermite indices (t,u,v) with t+u+v <= L
+    """
+    return [(t, u, v) for t in range(L+1) for u in range(L-t+1) for v in range(L-t-u+1)]
+
+def _gaussian_shell(center, alpha, L):
+    """
+    Shell of single normalized Cartesian Gaussians with exponent alpha and
+    angular momentum L
+    """
+    alphas = np.array([alpha])
+    powers = _cartesian_powers(L)
+
+    return Shell(np.array(center, dtype=np.float64), alphas, np.ones(1), powers, [],
+                 _primitive_norms(alphas, powers))
+
+def _unit_shell(shell):
+    """
+    Constant s-type 'shell' on the center of shell, such that a single shell
+    can be handled as a pair of shells
+    """
+    return Shell(shell.center, np.zeros(1), np.ones(1), [(0,0,0)], [], np.ones((1,1)))
+
+def auxiliary_basis(cgfs, nuclei, npol=2, beta=3.0):
+    """
+    Generate a compact auxiliary basis set for the products of the basis
+    functions in cgfs; returns a list of shell pairs whose products are the
+    auxiliary functions
+
+    For every atom, the products of all pairs of its shells are included,
+    which describe the products of basis functions on the same atom
+    exactly. The products of basis functions on different atoms are
+    polarized towards the other atom, which is described by single
+    Gaussians with an angular momentum one (npol exponents) and two (one
+    exponent) higher than the highest angular momentum of these products.
+    Their exponents start at twice the smallest exponent of the atom and
+    increase by a factor beta.
+    """
+    aux = []
+    for pos, _ in nuclei:
+        shells = build_shells([f for f in cgfs if np.allclose(f.p, pos)])
+        aux += [(sa, sb) for a, sa in enumerate(shells) for sb in shells[:a+1]]
+        lmax = 2 * max(sum(s.powers[0]) for s in shells)
+        amin = min(np.min(s.alphas) for s in shells)
+        for L, n in ((lmax + 1, npol), (lmax + 2, 1)):
+            for k in range(n):
+                shell = _gaussian_shell(pos, 2.0 * amin * beta**k, L)
+                aux.append((shell, _unit_shell(shell)))
+
+    return aux
+
+def _distribution(pairs):
+    """
+    Expand the products of the functions of a list of shell pairs of the
+    same shell_class in Hermite Gaussians; returns the coefficients of
+    shape (na*nb, number of Hermite indices, number of primitive pairs),
+    the exponents and centers of the primitive pairs and the highest
+    angular momentum
+    """
+    sa0, sb0 = pairs[0]
+    la = sum(sa0.powers[0])
+    lb = sum(sb0.powers[0])
+    na, nb = len(sa0.powers), len(sb0.powers)
+    K = len(sa0.alphas) * len(sb0.alphas)
+
+    a = np.concatenate([np.repeat(sa.alphas, len(sb.alphas)) for sa, sb in pairs])
+    b = np.concatenate([np.tile(sb.alphas, len(sa.alphas)) for sa, sb in pairs])
+    A = np.repeat([sa.center for sa, _ in pairs], K, axis=0)
+    B = np.repeat([sb.center for _, sb in pairs], K, axis=0)
+    p = a + b
+    P = (a[:,np.newaxis] * A + b[:,np.newaxis] * B) / p[:,np.newaxis]
+    E = _hermite_coefficients(la, lb, a, b, (A - B).transpose())
+
+    c = np.concatenate([(sa.weights[:,np.newaxis,:,np.newaxis] *
+                         sb.weights[np.newaxis,:,np.newaxis,:]).reshape(na, nb, K)
+                        for sa, sb in pairs], axis=2).reshape(na*nb, -1)
+    i = np.repeat(np.array(sa0.powers), nb, axis=0)
+    j = np.tile(np.array(sb0.powers), (na, 1))
+    H = np.array([c * E[i[:,0],j[:,0],t,0] * E[i[:,1],j[:,1],u,1] * E[i[:,2],j[:,2],v,2]
+                  for t, u, v in _hermite_indices(la + lb)]).transpose(1,0,2)
+
+    return H, p, P, la + lb
+
+def _coulomb(bra, ket, nbra, nket):
+    """
+    Calculate the Coulomb integrals between two sets of distributions
+    (see _distribution) consisting of nbra and nket shell pairs; returns
+    an array of shape (functions, nbra, functions, nket)
+    """
+    H1, p, P, L1 = bra
+    H2, q, Q, L2 = ket
+    pq = p[:,np.newaxis] + q[np.newaxis,:]
+    alpha = p[:,np.newaxis] * q[np.newaxis,:] / pq
+    R = _hermite_integrals(L1 + L2, alpha, P[:,np.newaxis,:] - Q[np.newaxis,:,:])
+    herm1 = _hermite_indices(L1)
+
+    # contract the Hermite integrals with the coefficients of the ket,
+    # wherein the Hermite Gaussians of the ket carry a sign (-1)^(t+u+v),
+    # and subsequently with those of the bra
+    V = 0.0
+    for h, (t, u, v) in enumerate(_hermite_indices(L2)):
+        Rh = np.array([R[(t+t1, u+u1, v+v1)] for t1, u1, v1 in herm1])
+        Y = np.einsum('ahm,hmn->amn', H1, Rh)
+        V = V + (-1)**(t+u+v) * Y[:,:,np.newaxis,:] * H2[np.newaxis,np.newaxis,:,h,:]
+    V = V * (2.0 * np.pi**2.5 / (p[:,np.newaxis] * q[np.newaxis,:] * np.sqrt(pq)))[:,np.newaxis,:]
+
+    # sum the primitive pairs of every shell pair
+    n1, n2 = H1.shape[0], H2.shape[0]
+    return np.sum(V.reshape(n1, nbra, -1, n2, nket, len(q) // nket), axis=(2,5))
+
+def _classes(pairs):
+    """
+    Group a list of shell pairs by their shell_class; returns lists of the
+    positions of the pairs in every group
+    """
+    classes = {}
+    for n, (sa, sb) in enumerate(pairs):
+        classes.setdefault(shell_class(sa, sb), []).append(n)
+
+    return list(classes.values())
+
+def _offsets(pairs):
+    """
+    Index of the first product function of every shell pair
+    """
+    return np.cumsum([0] + [len(sa.powers) * len(sb.powers) for sa, sb in pairs])
+
+def three_index(cgfs, aux):
+    """
+    Calculate the three-index integrals (ij|P) for all basis function pairs
+    and auxiliary functions P, given as shell pairs; returns an array of
+    shape (Naux,N,N)
+
+    The integrals are evaluated per pair of shell classes from the Hermite
+    expansions of the products of basis functions and of the auxiliary
+    functions (McMurchie-Davidson), rather than via the four-index
+    repulsion integrals of PyQInt.
+    """
+    shells = build_shells(cgfs)
+    norms = np.zeros(len(cgfs))
+    for s in shells:
+        norms[s.indices] = 1.0 / np.sqrt(np.diag(shell_pair_integrals([(s, s)], [])[0][:,:,0]))
+
+    N = len(cgfs)
+    offsets = _offsets(aux)
+    B = np.zeros((offsets[-1], N, N))
+    kets = [(group, _distribution([aux[m] for m in group])) for group in _classes(aux)]
+    pairs = [(sa, sb) for a, sa in enumerate(shells) for sb in shells[:a+1]]
+    for group in _classes(pairs):
+        bra = _distribution([pairs[n] for n in group])
+        sa0, sb0 = pairs[group[0]]
+        for kgroup, ket in kets:
+            V = _coulomb(bra, ket, len(group), len(kgroup))
+            V = V.reshape(len(sa0.powers), len(sb0.powers), len(group), -1, len(kgroup))
+            for n, (sa, sb) in enumerate(pairs[k] for k in group):
+                ia = np.array(sa.indices)[np.newaxis,:,np.newaxis]
+                ib = np.array(sb.indices)[np.newaxis,np.newaxis,:]
+                for m, k in enumerate(kgroup):
+                    ic = np.arange(offsets[k], offsets[k+1])[:,np.newaxis,np.newaxis]
+                    B[ic,ia,ib] = B[ic,ib,ia] = V[:,:,n,:,m].transpose(2,0,1)
+    B *= np.outer(norms, norms)
+
+    return B
+
+def two_index(aux):
+    """
+    Calculate the Coulomb metric (P|Q) of the auxiliary functions
+    """
+    offsets = _offsets(aux)
+    M = np.zeros((offsets[-1], offsets[-1]))
+    dists = [(group, _distribution([aux[m] for m in group])) for group in _classes(aux)]
+    for bgroup, bra in dists:
+        for kgroup, ket in dists:
+            V = _coulomb(bra, ket, len(bgroup), len(kgroup))
+            for n, k in enumerate(bgroup):
+                for m, l in enumerate(kgroup):
+                    M[offsets[k]:offsets[k+1],offsets[l]:offsets[l+1]] = V[:,n,:,m]
+
+    return M
+
+def inverse_sqrt(M, cutoff=1e-10):
+    """
+    Calculate M^(-1/2) discarding all eigenvalues below cutoff, which arise
+    from (near) linear dependencies in the auxiliary basis
+    """
+    m, U = np.linalg.eigh(M)
+    keep = m > cutoff
+
+    return U[:,keep].dot(np.diag(1.0 / np.sqrt(m[keep])))
+
+class RIFock:
+    """
+    Build G using the resolution-of-the-identity (density fitting)
+    approximation of the two-electron integrals
+
+    (ij|kl) is approximated by sum_Q L[ij,Q] * L[kl,Q] with
+    L[ij,Q] = sum_P (ij|P) (P|Q)^(-1/2), which is stored for the pairs
+    i>=j only, such that N(N+1)/2 Naux numbers are kept.
+    """
+    def __init__(self, cgfs, nuclei, npol=2, beta=3.0):
+        self.aux = auxiliary_basis(cgfs, nuclei, npol, beta)
+        Minv = inverse_sqrt(two_index(self.aux))
+        pi, pj = np.tril_indices(len(cgfs))
+        self.L = three_index(cgfs, self.aux)[:,pi,pj].transpose().dot(Minv)
+
+    def build_g(self, P, difference=False):
+        """
+        Build G for the (difference) density matrix P; returns G and the
+        number of skipped quartets
+        """
+        return build_g_factorized(P, self.L), 0
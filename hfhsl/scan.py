@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from queue import Empty
+import time
+from pyqint import Molecule
+import numpy as np
+from .scf import scf
+
+def build_geometry(atoms, name='scan'):
+    """
+    Build a PyQInt Molecule from a list of (symbol, x, y, z) tuples, with
+    the coordinates in atomic units (Bohr)
+    """
+    mol = Molecule(name)
+    for atom in atoms:
+        mol.add_atom(*atom)
+
+    return mol
+
+def split_branches(npoints, nbranches):
+    """
+    Divide the indices of npoints scan points into nbranches contiguous
+    branches of (nearly) equal length
+    """
+    return [list(b) for b in np.array_split(np.arange(npoints), nbranches) if len(b) > 0]
+
+def _scan_branch(points, basis, kwargs, reuse=True):
+    """
+    Run the SCF for the consecutive points (index, atoms) of a single
+    branch, seeding every point with the converged density matrix of the
+    previous one; yields the result of every point as it completes
+    """
+    guess = kwargs.pop('guess', 'zero')
+    P = None
+    for index, atoms in points:
+        t0 = time.perf_counter()
+        result = {'index': index, 'atoms': atoms, 'error': None}
+        try:
+            cgfs, nuclei = build_geometry(atoms).build_basis(basis)
+            res = scf(cgfs, nuclei, guess=guess if P is None else P, basis=basis,
+                      **kwargs)
+            result.update({
+                'energy': res['energy'],
+                'orbital_energies': res['orbital_energies'],
+                'niter': res['niter'],
+                'converged': res['converged'],
+                'status': res['status'],
+            })
+            # an unconverged density is a poor starting point for the next
+            # point, in which case the branch restarts from the guess
+            P = res['P'] if res['converged'] and reuse else None
+        except Exception as exc:
+            result['error'] = repr(exc)
+            P = None
+        result['time'] = time.perf_counter() - t0
+        yield result
+
+def _scan_worker(points, basis, kwargs, reuse, queue):
+    """
+    Run a single branch in a worker process and put the result of every
+    point in the queue
+    """
+    for result in _scan_branch(points, basis, kwargs, reuse):
+        queue.put(result)
+
+def scan(geometries, values=None, basis='sto3g', nbranches=1, reuse=True, **kwargs):
+    """
+    Perform a potential energy surface scan
+
+    The geometries are given either as a list, wherein every geometry is a
+    list of (symbol, x, y, z) tuples in Bohr, or as a function which maps
+    every one of values onto such a list, e.g. the bond length of CO via
+    lambda r: [('C', 0.0, 0.0, -r/2.0), ('O', 0.0, 0.0, r/2.0)]. The points
+    are divided into nbranches contiguous branches which run in parallel
+    processes. Within a branch, every point starts from the converged
+    density of the previous point, projected onto its basis set, unless
+    reuse is disabled. This is a generator which yields a dictionary with
+    the index, geometry, energy, orbital energies, number of iterations,
+    convergence status and time of every point as soon as it completes; errors are reported per
+    point rather than aborting the scan. All other keyword arguments are passed on to scf.
+    """
+    if values is not None:
+        geometries = [geometries(x) for x in values]
+    points = list(enumerate(geometries))
+    kwargs.setdefault('verbose', False)
+    branches = [[points[i] for i in branch]
+                for branch in split_branches(len(points), nbranches)]
+
+    if len(branches) == 1:
+        for result in _scan_branch(points, basis, kwargs, reuse):
+            yield result
+        return
+
+    with multiprocessing.Manager() as manager:
+        queue = manager.Queue()
+        with ProcessPoolExecutor(max_workers=len(branches)) as executor:
+            futures = [executor.submit(_scan_worker, branch, basis, dict(kwargs),
+                                       reuse, queue) for branch in branches]
+            remaining = len(points)
+            while remaining > 0:
+                try:
+                    result = queue.get(timeout=1.0)
+                except Empty:
+                    # raise the error of a worker which died unexpectedly
+                    # rather than waiting forever
+                    for future in futures:
+                        if future.done():
+                            future.result()
+                    continue
+                remaining -= 1
+                yield result
@@ -0,0 +1,421 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import tempfile
+import numpy as np
+from .convergence import ConvergenceControl
+from .diis import DIIS
+from .eigensolver import Eigensolver
+from .checkpoint import finished, resume, write_checkpoint
+from .cholesky import CholeskyFock
+from .direct import DirectFock
+from .eri import build_teint, print_stats
+from .fock import InCoreFock, PackedFock
+from .guess import initial_guess
+from .kernel import SCFKernel
+from .oneelectron import one_electron_matrices
+from .ri import RIFock
+from .soscf import SecondOrderSCF, natural_orbitals
+from .strategy import select_strategy
+from .symmetry import SymmetryAdaptedBasis
+from .telemetry import Telemetry, array_bytes
+from .teindex import teint_size
+
+# root mean square change of the density matrix below which DIIS resumes
+# after it was suspended by the stabilization of the iterations
+DIIS_RESUME = 1e-2
+
+def nuclear_repulsion(nuclei):
+    """
+    Calculate the electrostatic repulsion energy between the nuclei
+    """
+    energy = 0.0
+    for i in range(0, len(nuclei)):
+        for j in range(i+1, len(nuclei)):
+            r = np.linalg.norm(np.array(nuclei[i][0]) - np.array(nuclei[j][0]))
+            energy += nuclei[i][1] * nuclei[j][1] / r
+
+    return energy
+
+def build_integrals(cgfs, nuclei, nprocs=1, threshold=None, verbose=True,
+                    strategy='incore', scratch=None, symmetry=None):
+    """
+    Calculate the one-electron matrices S, T and V and the two-electron
+    integrals teint; returns these together with the statistics of the
+    two-electron integral evaluation. For the 'disk' strategy, teint is
+    a memory-mapped array in the scratch folder and for the 'direct'
+    strategy, only the one-electron matrices are calculated. When a
+    SymmetryAdaptedBasis is given as symmetry, only the symmetry-unique
+    two-electron integrals are evaluated and the others are copied.
+    """
+    S, T, V = one_electron_matrices(cgfs, nuclei, nprocs)
+    if strategy in ('direct', 'ri', 'cholesky'):
+        return (S, T, V, None), None
+
+    out = None
+    if strategy == 'disk':
+        # the file is removed as soon as the memory map is closed
+        out = np.memmap(tempfile.TemporaryFile(dir=scratch), dtype=np.float64,
+                        mode='w+', shape=(teint_size(len(cgfs)),))
+    mask = None
+    if symmetry is not None:
+        mask, rep, sign = symmetry.unique_quartets()
+    teint, eri_stats = build_teint(cgfs, nprocs=nprocs, threshold=threshold, out=out,
+                                   mask=mask)
+    if symmetry is not None:
+        symmetry.expand_teint(teint, rep, sign)
+    if verbose and (nprocs != 1 or threshold is not None or symmetry is not None):
+        print_stats(eri_stats)
+
+    return (S, T, V, teint), eri_stats
+
+def scf(cgfs, nuclei, nprocs=1, threshold=None, maxiter=100, etol=1e-5,
+        ptol=1e-4, damping=0.0, level_shift=0.0, stabilize=True, verbose=True,
+        ints=None, diis=False, diis_size=6, diis_start=1, incremental=False,
+        rebuild=10, strategy='auto', memory=2*1024**3, scratch=None,
+        cholesky_tol=1e-6, guess='zero', basis='sto3g',
+        checkpoint=None, checkpoint_every=1, symmetry=False, telemetry=None,
+        soscf=False, soscf_start=0.1, eigensolver='auto'):
+    """
+    Perform a restricted Hartree-Fock calculation
+
+    This routine follows exactly the same steps as the solution scripts of
+    the exercises, but uses the faster routines of this package. The
+    iterations are converged when the energy changes less than etol and the
+    root mean square change of the density matrix lies below ptol (None:
+    energy only). A fraction damping of the previous density matrix can be
+    mixed into the new one and the virtual orbitals can be raised by
+    level_shift Ht; when stabilize is set, both are switched on (and raised
+    further) as soon as the energy oscillates, while DIIS is suspended until
+    the density matrix has settled. The iterations are aborted when these
+    do not converge, which is reported as the status of the result.
+    Previously calculated integrals can be supplied via ints as a tuple
+    (S,T,V,teint).
+    When diis is set, the Fock matrices are extrapolated using DIIS with a
+    subspace of diis_size matrices from iteration diis_start onwards.
+    When incremental is set, G is updated from the change in the density
+    matrix; density elements whose contributions fall below threshold are
+    skipped and G is rebuilt from the full density every rebuild iterations
+    (0: never).
+    The strategy sets how the two-electron integrals are handled: these are
+    calculated once and kept in memory ('incore') or in a memory-mapped
+    file in the scratch folder ('disk'), or recalculated in every iteration
+    ('direct'). By default ('auto'), the strategy is chosen based on the
+    memory budget given by memory in bytes. Alternatively, the integrals
+    can be approximated by density fitting over an auxiliary basis ('ri')
+    or by a Cholesky decomposition down to cholesky_tol ('cholesky').
+    The initial density matrix is either empty ('zero', as in the exercises)
+    or obtained from the core Hamiltonian ('core'), the generalized
+    Wolfsberg-Helmholz approximation ('gwh') or the superposition of the
+    atomic densities in the given basis set ('sad'). Alternatively, guess
+    can be the density matrix of a previous calculation, for instance of a
+    nearby geometry, which is projected onto the current basis set.
+    When a checkpoint file is given, the state of the calculation is written
+    to it every checkpoint_every iterations (0: only at the end) and a
+    calculation of the same geometry and strategy resumes from an existing
+    checkpoint, or returns its result when it had converged with criteria
+    at least as tight or reached maxiter; otherwise, its density matrix is
+    projected and used as the initial guess.
+    When symmetry is set, the abelian point group of the nuclei is detected,
+    only the symmetry-unique two-electron integrals are evaluated and the
+    Fock matrix is diagonalized per irreducible representation.
+    The time spent per phase and the number of evaluated and skipped
+    integrals are collected by telemetry (a Telemetry object), which writes
+    these as JSON lines for the setup, every iteration and the whole run.
+    When soscf is set, the diagonalization is replaced by second-order
+    (quasi-Newton) orbital rotations as soon as the root mean square change
+    of the density matrix drops below soscf_start (0: never; infinity:
+    from the second iteration onwards). The eigensolver sets whether all
+    orbitals are obtained in every iteration ('full') or only the occupied
+    ones, either directly ('subset') or iteratively starting from those of
+    the previous iteration ('lobpcg'); 'auto' selects between 'full' and
+    'subset' from the size of the basis set and the number of electrons.
+    Returns a dictionary holding the total energy, the orbital energies and
+    the coefficient, density and Fock matrices among others.
+    """
+    nelec = int(np.sum([n[1] for n in nuclei]))
+    nocc = nelec // 2
+    N = len(cgfs)
+    if telemetry is None:
+        telemetry = Telemetry()
+    sab = SymmetryAdaptedBasis(cgfs, nuclei) if symmetry else None
+
+    # STEP 2: calculate S,T,V,H,TEINT integrals
+    if strategy == 'auto':
+        strategy, message = select_strategy(N, memory, scratch)
+        if verbose:
+            print('Selecting strategy %s: %s' % (strategy, message))
+    with telemetry.phase('integrals'):
+        if ints is None:
+            ints, eri_stats = build_integrals(cgfs, nuclei, nprocs, threshold, verbose,
+                                              strategy, scratch, sab)
+        else:
+            eri_stats = None
+        S, T, V, teint = ints
+        H = T + V
+        if strategy == 'incore':
+            fock = InCoreFock(teint, N, threshold)
+        elif strategy == 'disk':
+            fock = PackedFock(teint, N)
+        elif strategy == 'direct':
+            fock = DirectFock(cgfs, threshold)
+        elif strategy == 'ri':
+            fock = RIFock(cgfs, nuclei)
+        elif strategy == 'cholesky':
+            fock = CholeskyFock(cgfs, cholesky_tol)
+        else:
+            raise ValueError('Unknown strategy for the two-electron integrals: %s' % strategy)
+        enuc = nuclear_repulsion(nuclei)
+    if eri_stats is not None:
+        telemetry.count('integrals_evaluated', eri_stats['integrals'])
+        telemetry.count('integrals_skipped', eri_stats['skipped'])
+    if strategy in ('direct', 'cholesky'):
+        telemetry.count('integrals_evaluated', fock.nevaluated)
+    telemetry.peak('eri_store_bytes', array_bytes(teint, fock))
+
+    # STEP 3: calculate transformation matrix
+    with telemetry.phase('orthogonalization'):
+        s, U = np.linalg.eigh(S)
+        X = U.dot(np.diag(1.0/np.sqrt(s)))
+        if sab is not None:
+            Xs = sab.orthogonalizers(S)
+
+    # STEP 4: obtain initial guess for density matrix
+    with telemetry.phase('guess'):
+        P = initial_guess(guess, H, S, X, nocc, cgfs, nuclei, basis)
+        accelerator = DIIS(diis_size, diis_start) if diis else None
+        start, energies, done = 0, [], None
+        if checkpoint is not None:
+            P, start, energies = resume(checkpoint, nuclei, basis, P, S, X, nocc,
+                                        accelerator, strategy)
+            done = finished(checkpoint, nuclei, basis, maxiter, etol, ptol, strategy)
+            if verbose and done is not None:
+                print('Restoring finished calculation from checkpoint %s' % checkpoint)
+            elif verbose and start > 0:
+                print('Resuming from checkpoint %s at iteration %i' % (checkpoint, start))
+    kernel = SCFKernel(H, X, nocc, enuc, Eigensolver(nocc, eigensolver))
+    telemetry.flush('setup', N=N, strategy=strategy)
+
+    # the previous density and G matrix for incremental Fock builds
+    Pprev = None
+    Gprev = None
+    skipped = []
+
+    control = ConvergenceControl(etol, ptol, damping, level_shift, stabilize)
+    status = 'maxiter'
+    newton = None
+    soscf_iteration = None
+    suspended = False
+
+    # a finished calculation is not iterated any further; its result is
+    # taken from the checkpoint
+    stop = maxiter
+    if done is not None:
+        stop = start
+        C, F, e = done['C'], done['F'], done['orbital_energies']
+        energy, niter, labels = energies[-1], start - 1, None
+        status = 'converged' if done['converged'] else 'maxiter'
+        if len(e) < X.shape[1]:
+            # only the occupied orbitals were stored
+            kernel.diagonalize(F)
+            e, C = kernel.complete()
+
+    for niter in range(start, stop):
+        # switch from diagonalization to second-order orbital rotations
+        if soscf and newton is None and control.delta_rms is not None and \
+                control.delta_rms < soscf_start:
+            newton = SecondOrderSCF(nocc)
+            soscf_iteration = niter
+
+            # the rotations start from the natural orbitals of the (possibly
+            # damped) density matrix, including the virtual orbitals, and
+            # the density matrix is made consistent with these orbitals
+            C = natural_orbitals(P, S, X)
+            P = 2.0 * C[:,:nocc].dot(C[:,:nocc].transpose())
+            if verbose:
+                print("Switching to second-order orbital optimization.")
+
+
+        # STEP 5: calculate G,H,F,F' from P
+        nevaluated = getattr(fock, 'nevaluated', 0)
+        with telemetry.phase('fock'):
+            if incremental and Gprev is not None and (rebuild <= 0 or niter % rebuild != 0):
+                dG, nskipped = fock.build_g(P - Pprev, difference=True)
+                G = Gprev + dG
+            else:
+                G, nskipped = fock.build_g(P)
+            Pprev, Gprev = P, G
+            F = kernel.fock(G)
+        skipped.append(nskipped)
+
+        # in direct mode, the skipped quartets are integrals that are never
+        # evaluated rather than skipped density matrix elements
+        if strategy == 'direct':
+            telemetry.count('integrals_evaluated', fock.nevaluated - nevaluated)
+            telemetry.count('integrals_skipped', nskipped)
+        else:
+            telemetry.count('density_skipped', nskipped)
+        if suspended and control.delta_rms < DIIS_RESUME:
+            suspended = False
+        if accelerator is not None and newton is None and not suspended:
+            with telemetry.phase('diis'):
+                Fused = accelerator.extrapolate(F, P, S)
+        else:
+            Fused = F
+
+        # calculate the energy of the current P
+        with telemetry.phase('energy'):
+            energy = kernel.energy(P, F)
+
+        # STEP 6 and 7: diagonalize F' to obtain C' and e and calculate C
+        # from C', either at once or per irrep; the energies of the virtual
+        # orbitals are corrected for the level shift. Alternatively, the
+        # current orbitals are rotated by a second-order step.
+        gradient = None
+        with telemetry.phase('diagonalization'):
+            if newton is not None:
+                e, _, C, gradient = newton.step(F, C, energy)
+                labels = None
+            elif sab is not None:
+                e, C, labels = sab.diagonalize(control.shift(Fused, S, P), Xs)
+            else:
+                e, C = kernel.diagonalize(control.shift(Fused, S, P))
+                labels = None
+            if control.level_shift > 0.0 and newton is None:
+                e[nocc:] -= control.level_shift
+
+        # STEP 8: calculate P from C; the convergence is judged from the
+        # undamped density matrix
+        with telemetry.phase('density'):
+            Pold = P
+            P = kernel.density(C)
+            energies.append(energy)
+            settings = (control.damping, control.level_shift)
+            result = control.update(niter, energies, P, Pold)
+            if newton is None:
+                P = control.damp(P, Pold)
+
+        if verbose:
+            print("Iteration: %i Energy: %f" % (niter, energy))
+
+        # the DIIS subspace spanned by the oscillating Fock matrices is
+        # discarded when the iterations are stabilized and the extrapolation
+        # is suspended until the damped iterations have settled, as DIIS
+        # otherwise keeps driving the oscillation
+        if (control.damping, control.level_shift) != settings:
+            if verbose:
+                print("Oscillation detected, switching on damping (%.2f) and "
+                      "level shifting (%.2f Ht)." % (control.damping, control.level_shift))
+            if accelerator is not None:
+                accelerator.reset()
+                suspended = True
+
+        if result is not None:
+            status = result
+        if checkpoint is not None and (result is not None or niter == maxiter - 1 or
+                (checkpoint_every > 0 and (niter + 1) % checkpoint_every == 0)):
+            with telemetry.phase('checkpoint'):
+                write_checkpoint(checkpoint, nuclei, basis, niter, energies,
+                                 C, P, F, e, accelerator, result == 'converged',
+                                 etol, ptol, strategy)
+        telemetry.flush('iteration', iteration=niter, energy=energy,
+                        delta_rms=control.delta_rms, orbital_gradient=gradient)
+
+        if result == 'converged':
+            if verbose:
+                print("Stopping SCF cycle, convergence reached.")
+            break
+        if result is not None:
+            if verbose:
+                print("Aborting SCF cycle, no convergence (%s)." % result)
+            break
+    else:
+        if verbose and status == 'maxiter':
+            print("Aborting SCF cycle, no convergence within %i iterations." % maxiter)
+    converged = status == 'converged'
+
+    # obtain all orbitals when only the occupied ones were calculated
+    if len(e) < X.shape[1]:
+        e, C = kernel.complete()
+        if control.level_shift > 0.0:
+            e[nocc:] -= control.level_shift
+
+    # the orbitals of second-order steps and of a finished checkpoint
+    # carry no irrep labels yet
+    if sab is not None and labels is None:
+        labels = sab.classify(C)
+
+    if verbose and sab is not None:
+        sab.print_orbitals(e, labels, nocc)
+
+    timings = telemetry.finish(energy=energy, niter=niter + 1, status=status,
+                               N=N, strategy=strategy)
+
+    return {
+        'energy': energy,
+        'energies': energies,
+        'orbital_energies': e,
+        'C': C,
+        'P': P,
+        'F': F,
+        'niter': niter + 1,
+        'converged': converged,
+        'status': status,
+        'nuclei': nuclei,
+        'cgfs': cgfs,
+        'eri_stats': eri_stats,
+        'skipped': skipped,
+        'strategy': strategy,
+        'point_group': sab.group if sab is not None else None,
+        'irreps': labels,
+        'telemetry': timings,
+        'soscf_iteration': soscf_iteration,
+    }
+
+def calculate(mol, basis='sto3g', cache=None, **kwargs):
+    """
+    Perform a restricted Hartree-Fock calculation for a PyQInt Molecule;
+    when an IntegralCache is given, the integrals are taken from or stored
+    in this cache, provided that these are kept in memory or on disk
+    according to the strategy. All other keyword arguments are passed on
+    to scf.
+    """
+    cgfs, nuclei = mol.build_basis(basis)
+
+    # resolve the strategy before touching the cache such that a cached
+    # calculation respects the memory budget as well
+    strategy = kwargs.get('strategy', 'auto')
+    if strategy == 'auto':
+        strategy, message = select_strategy(len(cgfs), kwargs.get('memory', 2*1024**3),
+                                            kwargs.get('scratch'))
+        if kwargs.get('verbose', True):
+            print('Selecting strategy %s: %s' % (strategy, message))
+        kwargs['strategy'] = strategy
+
+    if cache is not None and kwargs.get('ints') is None and strategy in ('incore', 'disk'):
+        threshold = kwargs.get('threshold')
+        ints = cache.load(nuclei, basis, threshold)
+        if ints is None:
+            ints, _ = build_integrals(cgfs, nuclei, kwargs.get('nprocs', 1), threshold,
+                                      kwargs.get('verbose', True), strategy,
+                                      kwargs.get('scratch'))
+            cache.store(nuclei, basis, *ints, threshold=threshold)
+        kwargs['ints'] = ints
+
+    return scf(cgfs, nuclei, basis=basis, **kwargs)
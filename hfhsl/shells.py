@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from collections import namedtuple
+from scipy.special import hyp1f1
+import numpy as np
+
+# a shell is a set of basis functions on the same center which share their
+# exponents and contraction coefficients and only differ in their powers
+# (l,m,n) of x, y and z, e.g. the px, py and pz functions of an atom;
+# indices are the positions of these functions in the list of CGFs and
+# weights the contraction coefficients times the normalization constants
+# of the primitives for every function of the shell
+Shell = namedtuple('Shell', ['center', 'alphas', 'coeffs', 'powers', 'indices', 'weights'])
+
+def build_shells(cgfs):
+    """
+    Group a list of CGFs, as produced by Molecule.build_basis, into shells
+    """
+    groups = []
+    for idx, f in enumerate(cgfs):
+        center = np.array(f.p, dtype=np.float64)
+        alphas = np.array([g.alpha for g in f.gtos])
+        coeffs = np.array([g.c for g in f.gtos])
+        powers = (f.gtos[0].l, f.gtos[0].m, f.gtos[0].n)
+
+        # consecutive functions with identical center, exponents,
+        # coefficients and total angular momentum belong to the same shell
+        if groups:
+            g = groups[-1]
+            if sum(g[3][0]) == sum(powers) and np.array_equal(g[0], center) and \
+                    np.array_equal(g[1], alphas) and np.array_equal(g[2], coeffs):
+                g[3].append(powers)
+                g[4].append(idx)
+                continue
+        groups.append((center, alphas, coeffs, [powers], [idx]))
+
+    return [Shell(center, alphas, coeffs, powers, indices,
+                  _primitive_norms(alphas, powers) * coeffs)
+            for center, alphas, coeffs, powers, indices in groups]
+
+def _double_factorial(n):
+    """
+    Double factorial n!!, with (-1)!! = 1
+    """
+    return np.prod(np.arange(n, 0, -2, dtype=np.float64))
+
+def _primitive_norms(alphas, powers):
+    """
+    Normalization constants of the Cartesian Gaussian primitives, shape
+    (number of functions, number of exponents)
+    """
+    norms = []
+    for l, m, n in powers:
+        denom = np.sqrt(_double_factorial(2*l-1) * _double_factorial(2*m-1) *
+                        _double_factorial(2*n-1))
+        norms.append((2.0 * alphas / np.pi)**0.75 * (4.0 * alphas)**((l+m+n)/2.0) / denom)
+
+    return np.array(norms)
+
+def _hermite_coefficients(imax, jmax, a, b, XAB):
+    """
+    Hermite expansion coefficients E[i,j,t,d] of the product of two
+    Gaussians with exponents a and b (arrays over all primitive pairs)
+    along the Cartesian directions d of their distance vectors XAB (shape
+    (3, number of primitive pairs)), for all powers i <= imax and j <= jmax
+    """
+    p = a + b
+    XPA = -b / p * XAB
+    XPB = a / p * XAB
+    E = np.zeros((imax+1, jmax+1, imax+jmax+2, 3, len(p)))
+    E[0,0,0] = np.exp(-a * b / p * XAB**2)
+    for i in range(imax+1):
+        for j in range(jmax+1):
+            if i == 0 and j == 0:
+                continue
+            # raise either i or j by one starting from a known coefficient
+            if i > 0:
+                prev, X = E[i-1,j], XPA
+            else:
+                prev, X = E[i,j-1], XPB
+            for t in range(i+j+1):
+                E[i,j,t] = X * prev[t] + (t+1) * prev[t+1]
+                if t > 0:
+                    E[i,j,t] += prev[t-1] / (2.0 * p)
+
+    return E
+
+def _boys(n, T):
+    """
+    Boys function F_n(T)
+    """
+    return hyp1f1(n + 0.5, n + 1.5, -T) / (2.0 * n + 1.0)
+
+def _hermite_integrals(L, p, PC):
+    """
+    Hermite Coulomb integrals R[t,u,v] for t+u+v <= L, for the primitive
+    pairs with exponents p (shape (npair,1)) and the distances PC between
+    their centers and the nuclei (shape (npair,nnuc,3))
+    """
+    T = p * np.sum(PC**2, axis=2)
+    R = {}
+    for n in range(L, -1, -1):
+        Rn = {(0,0,0): (-2.0 * p)**n * _boys(n, T)}
+        # raise t, u and v one at a time using the integrals of order n+1
+        for t in range(L-n+1):
+            for u in range(L-n-t+1):
+                for v in range(L-n-t-u+1):
+                    if (t,u,v) == (0,0,0):
+                        continue
+                    if t > 0:
+                        key, X, k = (t-1,u,v), PC[:,:,0], t-1
+                    elif u > 0:
+                        key, X, k = (t,u-1,v), PC[:,:,1], u-1
+                    else:
+                        key, X, k = (t,u,v-1), PC[:,:,2], v-1
+                    value = X * R[key]
+                    if k > 0:
+                        lower = list(key)
+                        lower[(t == 0) + (t == 0 and u == 0)] -= 1
+                        value = value + k * R[tuple(lower)]
+                    Rn[(t,u,v)] = value
+        R = Rn
+
+    return R
+
+def shell_class(sa, sb):
+    """
+    Key of a pair of shells; pairs with the same key share their angular
+    components and number of primitives and can be evaluated together
+    """
+    return (tuple(sa.powers), tuple(sb.powers), len(sa.alphas), len(sb.alphas))
+
+def shell_pair_integrals(pairs, nuclei):
+    """
+    Calculate the overlap, kinetic and nuclear attraction integrals for all
+    functions of a list of shell pairs (sa, sb) of the same shell_class
+
+    The Gaussian product quantities and the Hermite expansion coefficients
+    are calculated once for every primitive pair of every shell pair, from
+    which the integrals of all combinations of angular components follow.
+    All shell pairs are handled in the same array operations. Returns S
+    and T of shape (na, nb, len(pairs)) and V of shape (len(nuclei), na, nb,
+    len(pairs)), with na and nb the number of functions per shell.
+    """
+    sa0, sb0 = pairs[0]
+    la = sum(sa0.powers[0])
+    lb = sum(sb0.powers[0])
+    na, nb = len(sa0.powers), len(sb0.powers)
+    K = len(sa0.alphas) * len(sb0.alphas)
+
+    # exponents and centers of all primitive pairs of all shell pairs
+    a = np.concatenate([np.repeat(sa.alphas, len(sb.alphas)) for sa, sb in pairs])
+    b = np.concatenate([np.tile(sb.alphas, len(sa.alphas)) for sa, sb in pairs])
+    A = np.repeat([sa.center for sa, _ in pairs], K, axis=0)
+    B = np.repeat([sb.center for _, sb in pairs], K, axis=0)
+    p = a + b
+    P = (a[:,np.newaxis] * A + b[:,np.newaxis] * B) / p[:,np.newaxis]
+
+    # Hermite coefficients per Cartesian direction; j runs up to lb+2 for
+    # the kinetic energy integrals
+    E = _hermite_coefficients(la, lb+2, a, b, (A - B).transpose())
+    E = [E[:,:,:,d] for d in range(3)]
+
+    # one-dimensional overlap and kinetic integrals
+    S1 = [E[d][:,:,0] * np.sqrt(np.pi / p) for d in range(3)]
+    T1 = []
+    for d in range(3):
+        T1d = np.zeros((la+1, lb+1, len(p)))
+        for j in range(lb+1):
+            T1d[:,j] = 2.0 * b * (2*j+1) * S1[d][:,j] - 4.0 * b**2 * S1[d][:,j+2]
+            if j > 1:
+                T1d[:,j] -= j * (j-1) * S1[d][:,j-2]
+        T1.append(0.5 * T1d)
+
+    # contraction coefficients times normalization of every primitive pair
+    # for every combination of angular components, shape (na, nb, npair)
+    c = np.concatenate([(sa.weights[:,np.newaxis,:,np.newaxis] *
+                         sb.weights[np.newaxis,:,np.newaxis,:]).reshape(na, nb, K)
+                        for sa, sb in pairs], axis=2)
+
+    # select the one-dimensional integrals of every combination of
+    # angular components at once, shape (na, nb, npair)
+    pa = np.array(sa0.powers)
+    pb = np.array(sb0.powers)
+    i = [pa[:,d][:,np.newaxis] for d in range(3)]
+    j = [pb[:,d][np.newaxis,:] for d in range(3)]
+    sx, sy, sz = [S1[d][i[d],j[d]] for d in range(3)]
+    tx, ty, tz = [T1[d][i[d],j[d]] for d in range(3)]
+
+    # sum the primitive pairs of every shell pair
+    S = np.sum((c * sx * sy * sz).reshape(na, nb, -1, K), axis=3)
+    T = np.sum((c * (tx * sy * sz + sx * ty * sz + sx * sy * tz)).reshape(na, nb, -1, K),
+               axis=3)
+
+    V = np.zeros((len(nuclei), na, nb, len(pairs)))
+    if len(nuclei) > 0:
+        charges = np.array([charge for _, charge in nuclei], dtype=np.float64)
+        C = np.array([pos for pos, _ in nuclei], dtype=np.float64)
+        R = _hermite_integrals(la + lb, p[:,np.newaxis], P[:,np.newaxis,:] - C)
+        v = 0.0
+        for (t, u, w), Rtuw in R.items():
+            Etuw = E[0][i[0],j[0],t] * E[1][i[1],j[1],u] * E[2][i[2],j[2],w]
+            v = v + (c * Etuw * 2.0 * np.pi / p)[:,:,:,np.newaxis] * Rtuw
+        v = np.sum(v.reshape(na, nb, -1, K, len(nuclei)), axis=3)
+        V = -charges[:,np.newaxis,np.newaxis,np.newaxis] * v.transpose(3,0,1,2)
+
+    return S, T, V
+
+def shell_one_electron_matrices(cgfs, nuclei, shells=None, per_nucleus=False):
+    """
+    Calculate the overlap, kinetic and nuclear attraction matrices per
+    pair of shells rather than per pair of basis functions
+
+    Only the shell pairs with a >= b are evaluated, grouped by their
+    shell_class, and mirrored. The contracted functions are normalized to
+    unity. The return values follow oneelectron.one_electron_matrices.
+    """
+    if shells is None:
+        shells = build_shells(cgfs)
+    classes = {}
+    for a, sa in enumerate(shells):
+        for sb in shells[:a+1]:
+            classes.setdefault(shell_class(sa, sb), []).append((sa, sb))
+
+    N = len(cgfs)
+    S = np.zeros((N,N))
+    T = np.zeros((N,N))
+    V = np.zeros((len(nuclei),N,N))
+    for pairs in classes.values():
+        Sab, Tab, Vab = shell_pair_integrals(pairs, nuclei)
+        for n, (sa, sb) in enumerate(pairs):
+            ia = np.array(sa.indices)[:,np.newaxis]
+            ib = np.array(sb.indices)[np.newaxis,:]
+            S[ia,ib] = Sab[:,:,n]
+            S[ib.transpose(),ia.transpose()] = Sab[:,:,n].transpose()
+            T[ia,ib] = Tab[:,:,n]
+            T[ib.transpose(),ia.transpose()] = Tab[:,:,n].transpose()
+            V[:,ia,ib] = Vab[:,:,:,n]
+            V[:,ib.transpose(),ia.transpose()] = Vab[:,:,:,n].transpose(0,2,1)
+
+    # normalize the contracted functions
+    norms = 1.0 / np.sqrt(np.diag(S))
+    S *= np.outer(norms, norms)
+    T *= np.outer(norms, norms)
+    V *= np.outer(norms, norms)
+
+    if per_nucleus:
+        return S, T, V
+
+    return S, T, np.sum(V, axis=0)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import numpy as np
+
+def rotation(kappa):
+    """
+    Build the unitary matrix exp(K) for the antisymmetric matrix K whose
+    virtual-occupied block is -kappa^T, wherein kappa is the matrix of
+    rotation angles between the occupied (rows) and virtual (columns)
+    orbitals; the exponential follows from the singular value
+    decomposition of kappa
+    """
+    nocc, nvirt = kappa.shape
+    U, sigma, Vt = np.linalg.svd(kappa, full_matrices=False)
+    V = Vt.transpose()
+    cos = np.diag(np.cos(sigma))
+    sin = np.diag(np.sin(sigma))
+
+    R = np.empty((nocc + nvirt, nocc + nvirt))
+    R[:nocc,:nocc] = np.eye(nocc) + U.dot(cos - np.eye(len(sigma))).dot(U.transpose())
+    R[:nocc,nocc:] = U.dot(sin).dot(Vt)
+    R[nocc:,:nocc] = -V.dot(sin).dot(U.transpose())
+    R[nocc:,nocc:] = np.eye(nvirt) + V.dot(cos - np.eye(len(sigma))).dot(Vt)
+
+    return R
+
+def natural_orbitals(P, S, X):
+    """
+    Obtain the natural orbitals of the density matrix P, ordered by
+    decreasing occupation, using the orthogonalization matrix X
+    """
+    n, V = np.linalg.eigh(X.transpose().dot(S).dot(P).dot(S).dot(X))
+
+    return X.dot(V[:,::-1])
+
+class SecondOrderSCF:
+    """
+    Quasi-Newton optimization of the orbitals
+
+    Rather than diagonalizing the Fock matrix, the occupied orbitals are
+    rotated into the virtual orbitals, C -> C exp(K), with the rotation
+    angles following from a quasi-Newton step. The gradient of the energy
+    with respect to the angles is -4 F_ia, wherein F_ia is an element of
+    the Fock matrix in the basis of the current orbitals, and the Hessian
+    is approximated by its diagonal 4 (e_a - e_i) and refined from the
+    gradients of the previous memory steps using the L-BFGS update. The
+    length of every step is bounded by a trust radius. A step that raises
+    the energy is rejected: it is retried from the previous orbitals with
+    half its length. Every step takes a single Fock build.
+    """
+    def __init__(self, nocc, memory=8, trust=0.5, min_gap=0.1):
+        self.nocc = nocc
+        self.memory = memory
+        self.trust = trust
+        self.min_gap = min_gap  # lower bound to e_a - e_i in the Hessian
+        self.steps = []
+        self.gradients = []
+        self.differences = []
+        self.last_step = None
+        self.last_gradient = None
+        self.last_energy = None
+        self.accepted = None
+
+    def canonicalize(self, F, C):
+        """
+        Diagonalize the Fock matrix within the occupied and within the
+        virtual orbitals, which leaves the density matrix unaffected;
+        returns the orbital energies, the orbitals and the Fock matrix in
+        the basis of these orbitals
+        """
+        o = self.nocc
+        Fmo = C.transpose().dot(F).dot(C)
+        eo, Uo = np.linalg.eigh(Fmo[:o,:o])
+        ev, Uv = np.linalg.eigh(Fmo[o:,o:])
+        C = np.hstack([C[:,:o].dot(Uo), C[:,o:].dot(Uv)])
+        Fmo = C.transpose().dot(F).dot(C)
+
+        # express the stored steps and gradients in the new orbitals
+        transform = lambda A: Uo.transpose().dot(A).dot(Uv)
+        self.steps = [transform(s) for s in self.steps]
+        self.differences = [transform(y) for y in self.differences]
+        if self.last_step is not None:
+            self.last_step = transform(self.last_step)
+            self.last_gradient = transform(self.last_gradient)
+
+        return np.concatenate([eo, ev]), C, Fmo
+
+    def direction(self, g, h):
+        """
+        L-BFGS two-loop recursion for the step -H^-1 g, starting from the
+        diagonal Hessian h
+        """
+        q = g.copy()
+        alphas = []
+        for s, y in reversed(list(zip(self.steps, self.differences))):
+            rho = 1.0 / np.sum(y * s)
+            alpha = rho * np.sum(s * q)
+            q -= alpha * y
+            alphas.append((rho, alpha))
+        r = q / h
+        for (s, y), (rho, alpha) in zip(zip(self.steps, self.differences), reversed(alphas)):
+            beta = rho * np.sum(y * r)
+            r += s * (alpha - beta)
+
+        return -r
+
+    def step(self, F, C, energy):
+        """
+        Take a step from the orbitals C given their Fock matrix F and
+        energy; returns the orbital energies and the canonical orbitals
+        from which the step is taken, the rotated orbitals and the norm of
+        the gradient. When the energy has risen, F and C are discarded and
+        a shorter step is taken from the previously accepted orbitals.
+        """
+        o = self.nocc
+        if self.last_energy is not None and energy > self.last_energy + 1e-10:
+            # the quadratic model was too optimistic; shrink the trust
+            # radius below the length of the rejected step
+            self.trust = 0.5 * np.linalg.norm(self.last_step)
+            self.steps, self.differences = [], []
+            e, C, g, h = self.accepted
+        else:
+            self.last_energy = energy
+            e, C, Fmo = self.canonicalize(F, C)
+            g = -4.0 * Fmo[:o,o:]
+            h = 4.0 * np.maximum(e[o:][np.newaxis,:] - e[:o][:,np.newaxis], self.min_gap)
+            self.accepted = (e, C, g, h)
+
+            # update the curvature information from the previous step
+            if self.last_step is not None:
+                y = g - self.last_gradient
+                if np.sum(y * self.last_step) > 1e-12:
+                    self.steps.append(self.last_step)
+                    self.differences.append(y)
+                    if len(self.steps) > self.memory:
+                        self.steps.pop(0)
+                        self.differences.pop(0)
+
+        d = self.direction(g, h)
+        norm = np.linalg.norm(d)
+        if norm > self.trust:
+            d *= self.trust / norm
+        self.last_step = d
+        self.last_gradient = g
+
+        return e, C, C.dot(rotation(d)), np.linalg.norm(g)
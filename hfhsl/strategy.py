@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import shutil
+import tempfile
+from .teindex import teint_size
+
+def estimate_memory(N):
+    """
+    Estimate the number of bytes of memory required to handle the
+    two-electron integrals of N basis functions for each of the strategies
+    """
+    nteint = teint_size(N)
+
+    return {
+        # packed teint array plus its unpacked four-index counterpart
+        'incore': 8 * (nteint + N**4),
+        # a single block of PackedFock plus the quartet indices thereof
+        'disk': 8 * min(nteint, 2**20) * 5,
+        # Cauchy-Schwarz bounds plus the J and K matrices
+        'direct': 8 * 3 * N**2,
+    }
+
+def disk_required(N):
+    """
+    Number of bytes on disk required to store the packed teint array
+    """
+    return 8 * teint_size(N)
+
+def select_strategy(N, memory=2*1024**3, scratch=None):
+    """
+    Select how to handle the two-electron integrals given a memory budget
+    in bytes: keep these in memory ('incore'), store them in a memory-mapped
+    file in the scratch folder ('disk') or recalculate them in every
+    iteration ('direct'). Returns the strategy and a message explaining the
+    choice.
+    """
+    required = estimate_memory(N)
+    if required['incore'] <= memory:
+        return 'incore', 'two-electron integrals require %.1f MB, keeping these in memory' % \
+            (required['incore'] / 1024**2)
+
+    if scratch is None:
+        scratch = tempfile.gettempdir()
+    free = shutil.disk_usage(scratch).free
+    if required['disk'] <= memory and disk_required(N) <= free:
+        return 'disk', 'two-electron integrals require %.1f MB, exceeding the memory budget ' \
+            'of %.1f MB; storing these on disk in %s' % \
+            (required['incore'] / 1024**2, memory / 1024**2, scratch)
+
+    # report only the checks that ruled out the disk strategy
+    reasons = []
+    if required['disk'] > memory:
+        reasons.append('reading these from disk requires %.1f MB of memory' %
+                       (required['disk'] / 1024**2))
+    if disk_required(N) > free:
+        reasons.append('storing these requires %.1f MB on disk, whereas only %.1f MB '
+                       'is free in %s' % (disk_required(N) / 1024**2, free / 1024**2, scratch))
+
+    return 'direct', 'two-electron integrals require %.1f MB, exceeding the memory ' \
+        'budget of %.1f MB; %s; recalculating these in every iteration' % \
+        (required['incore'] / 1024**2, memory / 1024**2, ' and '.join(reasons))
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from functools import reduce
+import numpy as np
+from .teindex import canonical_quartet_array, teindex, teint_size
+
+# the operations of D2h and its subgroups, with all symmetry elements
+# aligned with the Cartesian axes, are diagonal matrices; these are
+# represented by the signs of x, y and z after the operation
+OPERATIONS = {
+    'E':   (1, 1, 1),
+    'C2z': (-1, -1, 1),
+    'C2y': (-1, 1, -1),
+    'C2x': (1, -1, -1),
+    'i':   (-1, -1, -1),
+    'sxy': (1, 1, -1),
+    'sxz': (1, -1, 1),
+    'syz': (-1, 1, 1),
+}
+
+# the irreducible representations of the abelian point groups, identified
+# by the parity of a function x^a y^b z^c in x, y and z; for the groups with
+# a unique axis, the parities are given for the unique axis along z
+IRREPS = {
+    'D2h': {(0,0,0): 'Ag', (1,1,0): 'B1g', (1,0,1): 'B2g', (0,1,1): 'B3g',
+            (1,1,1): 'Au', (0,0,1): 'B1u', (0,1,0): 'B2u', (1,0,0): 'B3u'},
+    'D2':  {(0,0,0): 'A', (0,0,1): 'B1', (0,1,0): 'B2', (1,0,0): 'B3'},
+    'C2v': {(0,0,0): 'A1', (1,1,0): 'A2', (1,0,0): 'B1', (0,1,0): 'B2'},
+    'C2h': {(0,0,0): 'Ag', (1,0,1): 'Bg', (0,0,1): 'Au', (1,0,0): 'Bu'},
+    'C2':  {(0,0,0): 'A', (1,0,0): 'B'},
+    'Cs':  {(0,0,0): "A'", (0,0,1): "A''"},
+    'Ci':  {(0,0,0): 'Ag', (1,0,0): 'Au'},
+    'C1':  {(0,0,0): 'A'},
+}
+
+def center_of_charge(nuclei):
+    """
+    Calculate the center of the nuclear charges
+    """
+    charges = np.array([charge for _, charge in nuclei], dtype=np.float64)
+    positions = np.array([pos for pos, _ in nuclei], dtype=np.float64)
+
+    return charges.dot(positions) / np.sum(charges)
+
+def atom_permutation(nuclei, signs, tolerance=1e-6):
+    """
+    Return for every nucleus the index of the nucleus it is mapped onto by
+    the operation with the given signs (about the center of charge), or
+    None when the operation is not a symmetry operation of the nuclei
+    """
+    center = center_of_charge(nuclei)
+    positions = np.array([pos for pos, _ in nuclei], dtype=np.float64) - center
+    charges = [charge for _, charge in nuclei]
+    perm = []
+    for pos, charge in zip(positions, charges):
+        d = np.linalg.norm(positions - pos * np.array(signs), axis=1)
+        match = [k for k in np.flatnonzero(d < tolerance) if charges[k] == charge]
+        if not match:
+            return None
+        perm.append(match[0])
+
+    return perm
+
+def point_group(ops):
+    """
+    Identify the point group and its unique axis (0, 1 or 2 for x, y and
+    z, or None) from the names of its operations
+    """
+    axes = {'x': 0, 'y': 1, 'z': 2}
+    rotations = [op for op in ops if op.startswith('C2')]
+    planes = [op for op in ops if op.startswith('s')]
+    if len(ops) == 8:
+        return 'D2h', None
+    if len(ops) == 4:
+        if len(rotations) == 3:
+            return 'D2', None
+        axis = axes[rotations[0][2]]
+        if 'i' in ops:
+            return 'C2h', axis
+        return 'C2v', axis
+    if rotations:
+        return 'C2', axes[rotations[0][2]]
+    if planes:
+        # the unique axis is perpendicular to the plane
+        return 'Cs', [axes[a] for a in 'xyz' if a not in planes[0][1:]][0]
+    if 'i' in ops:
+        return 'Ci', None
+
+    return 'C1', None
+
+class SymmetryAdaptedBasis:
+    """
+    Symmetry-adapted linear combinations (SALCs) of the basis functions
+
+    The largest abelian point group (D2h or one of its subgroups) whose
+    symmetry elements are aligned with the Cartesian axes through the
+    center of charge is detected from the nuclei. Every operation maps a
+    basis function onto the same function on the equivalent atom, up to a
+    sign that follows from the powers of x, y and z of the function. The
+    basis functions are projected onto every irreducible representation,
+    yielding an orthonormal set of linear combinations per irrep in which
+    the Fock matrix is block-diagonal.
+    """
+    def __init__(self, cgfs, nuclei, tolerance=1e-6):
+        N = len(cgfs)
+        self.N = N
+
+        # find the nucleus and the position within the basis functions of
+        # that nucleus for every basis function
+        atoms = []
+        for f in cgfs:
+            d = [np.linalg.norm(np.array(f.p) - np.array(pos)) for pos, _ in nuclei]
+            atoms.append(int(np.argmin(d)))
+        atoms = np.array(atoms)
+        offsets = {a: np.flatnonzero(atoms == a)[0] for a in set(atoms)}
+        local = np.arange(N) - np.array([offsets[a] for a in atoms])
+        parities = np.array([[g.l, g.m, g.n] for g in (f.gtos[0] for f in cgfs)]) % 2
+
+        # every symmetry operation as a signed permutation of the basis
+        self.ops = {}
+        for name, signs in OPERATIONS.items():
+            perm = atom_permutation(nuclei, signs, tolerance)
+            if perm is None:
+                continue
+            target = np.array([offsets[perm[a]] for a in atoms]) + local
+            sign = np.prod(np.array(signs)**parities, axis=1)
+            self.ops[name] = (target, sign)
+        self.group, self.axis = point_group(list(self.ops))
+
+        # the irreps follow from the distinct characters of the functions
+        # x^a y^b z^c; the labels are assigned with the unique axis along z
+        order = [0, 1, 2] if self.axis is None else \
+            [a for a in range(3) if a != self.axis] + [self.axis]
+        self.irreps = []
+        self.characters = []
+        for label_parity, label in IRREPS[self.group].items():
+            parity = np.zeros(3, dtype=int)
+            parity[order] = label_parity
+            chars = [int(np.prod(np.array(OPERATIONS[op])**parity)) for op in self.ops]
+            if chars not in self.characters:
+                self.irreps.append(label)
+                self.characters.append(chars)
+
+        # project every basis function onto every irrep and keep an
+        # orthonormal set of the resulting combinations; irreps which are
+        # not spanned by the basis set are dropped
+        self.salcs = []
+        for chars in list(self.characters):
+            proj = np.zeros((N,N))
+            for chi, (target, sign) in zip(chars, self.ops.values()):
+                proj[target, np.arange(N)] += chi * sign
+            proj /= len(self.ops)
+            u, s, _ = np.linalg.svd(proj)
+            if np.count_nonzero(s > 0.5) == 0:
+                self.irreps.pop(len(self.salcs))
+                self.characters.pop(len(self.salcs))
+                continue
+            self.salcs.append(u[:,s > 0.5])
+
+        if sum(U.shape[1] for U in self.salcs) != N:
+            raise ValueError('The symmetry-adapted basis is incomplete')
+
+    def orthogonalizers(self, S):
+        """
+        Build the canonical orthogonalization matrix of every irrep block;
+        the columns of each matrix are expressed in the original basis
+        """
+        X = []
+        for U in self.salcs:
+            s, V = np.linalg.eigh(U.transpose().dot(S).dot(U))
+            X.append(U.dot(V).dot(np.diag(1.0/np.sqrt(s))))
+
+        return X
+
+    def diagonalize(self, F, X):
+        """
+        Diagonalize F per irrep block using the orthogonalizers X; returns
+        the orbital energies in ascending order, the coefficient matrix and
+        the irrep label of every orbital
+        """
+        energies = []
+        coefficients = []
+        labels = []
+        for label, Xb in zip(self.irreps, X):
+            e, Cprime = np.linalg.eigh(Xb.transpose().dot(F).dot(Xb))
+            energies.append(e)
+            coefficients.append(Xb.dot(Cprime))
+            labels += [label] * len(e)
+        energies = np.concatenate(energies)
+        order = np.argsort(energies, kind='stable')
+
+        return energies[order], np.hstack(coefficients)[:,order], [labels[k] for k in order]
+
+    def classify(self, C):
+        """
+        Assign every orbital in the columns of C to the irrep onto which it
+        has the largest projection, e.g. for orbitals that were not
+        obtained by diagonalize
+        """
+        weights = np.array([np.sum(U.transpose().dot(C)**2, axis=0) for U in self.salcs])
+
+        return [self.irreps[k] for k in np.argmax(weights, axis=0)]
+
+    def unique_quartets(self):
+        """
+        Determine the symmetry-unique two-electron integrals; returns a
+        boolean mask over teint which is True for one representative
+        integral of every set of symmetry-equivalent integrals, except for
+        those which vanish by symmetry, together with the index of this
+        representative and the sign relating every integral to its
+        representative (zero for vanishing integrals)
+        """
+        quartets, idx = canonical_quartet_array(self.N)
+        rep = np.arange(teint_size(self.N))
+        sign = np.ones(len(rep))
+        zero = np.zeros(len(idx), dtype=bool)
+        for target, s in self.ops.values():
+            other = teindex(*target[quartets.transpose()])
+            factor = reduce(np.multiply, s[quartets.transpose()])
+
+            # an integral which is mapped onto minus itself vanishes
+            zero |= (other == idx) & (factor < 0)
+
+            better = other < rep[idx]
+            rep[idx[better]] = other[better]
+            sign[idx[better]] = factor[better]
+        sign[idx[zero]] = 0.0
+
+        unique = np.zeros(len(rep), dtype=bool)
+        unique[idx] = (rep[idx] == idx) & ~zero
+
+        return unique, rep, sign
+
+    def expand_teint(self, teint, rep, sign):
+        """
+        Fill in all symmetry-equivalent integrals from their representatives
+        """
+        teint[:] = sign * teint[rep]
+
+        return teint
+
+    def print_orbitals(self, e, labels, nocc):
+        """
+        Print the orbital energies together with the irrep labels
+        """
+        print('Point group: %s' % self.group)
+        for n, (energy, label) in enumerate(zip(e, labels)):
+            print(('%4i %-4s %12.6f %s' % (n+1, label, energy, 'occ' if n < nocc else '')).rstrip())
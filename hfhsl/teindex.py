@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from collections import namedtuple
+from functools import lru_cache
+import numpy as np
+
+# precomputed compound indices for a basis set of a given size
+#   rep[i,j,k,l]   : index of (ij|kl) in teint
+#   exc[i,j,k,l]   : index of (ik|lj) in teint
+#   quartets[idx]  : the canonical quartet (i,j,k,l) of teint[idx], or
+#                    (-1,-1,-1,-1) when idx is not used for this basis size
+IndexMap = namedtuple('IndexMap', ['rep', 'exc', 'quartets'])
+
+def teindex(i, j, k, l):
+    """
+    Vectorized equivalent of PyQInt.teindex; the indices can be integers
+    or (broadcastable) integer arrays
+    """
+    i, j, k, l = (np.asarray(x, dtype=np.int64) for x in (i, j, k, l))
+    ij = np.where(i >= j, i * (i + 1) // 2 + j, j * (j + 1) // 2 + i)
+    kl = np.where(k >= l, k * (k + 1) // 2 + l, l * (l + 1) // 2 + k)
+
+    return np.where(ij >= kl, ij * (ij + 1) // 2 + kl, kl * (kl + 1) // 2 + ij)
+
+def teint_size(N):
+    """
+    Size of the teint array for N basis functions; this is the same value
+    as obtained from integrator.teindex(N,N,N,N)
+    """
+    return int(teindex(N, N, N, N))
+
+def canonical_quartets(N):
+    """
+    Generate all canonical quartets (i,j,k,l) with i>=j, k>=l and ij>=kl
+    together with their index in teint; every unique two-electron integral
+    is produced exactly once
+    """
+    idx = 0
+    for i in range(N):
+        for j in range(i+1):
+            for k in range(i+1):
+                for l in range(k+1 if k < i else j+1):
+                    yield i, j, k, l, idx
+                    idx += 1
+
+def canonical_quartet_rows(N, start, stop):
+    """
+    Return the canonical quartets (ij|kl) for all pairs ij in [start,stop)
+    and their indices in teint; these indices run consecutively from
+    start*(start+1)/2 up to stop*(stop+1)/2
+    """
+    # all pairs i>=j; the index of pair (i,j) is i*(i+1)/2+j
+    pi, pj = np.tril_indices(N)
+
+    # all pairs of pairs ij>=kl; the index of (ij|kl) is ij*(ij+1)/2+kl,
+    # which runs consecutively over the lower triangle
+    rows = np.arange(start, stop)
+    ij = np.repeat(rows, rows + 1)
+    idx = np.arange(start * (start + 1) // 2, stop * (stop + 1) // 2)
+    kl = idx - ij * (ij + 1) // 2
+    quartets = np.stack([pi[ij], pj[ij], pi[kl], pj[kl]], axis=1)
+
+    return quartets, idx
+
+@lru_cache(maxsize=None)
+def canonical_quartet_array(N):
+    """
+    Array version of canonical_quartets; returns an (M,4) array of quartets
+    and an array holding their M indices in teint. The result is cached
+    per N and read-only.
+    """
+    quartets, idx = canonical_quartet_rows(N, 0, N * (N + 1) // 2)
+
+    for arr in (quartets, idx):
+        arr.setflags(write=False)
+
+    return quartets, idx
+
+@lru_cache(maxsize=None)
+def index_map(N):
+    """
+    Build the compound indices of all N^4 two-electron integrals at once
+
+    The result is cached per N and is thus reused over all SCF iterations
+    and all calculations within the same Python session. The arrays are
+    marked read-only as they are shared among all callers.
+    """
+    i, j, k, l = np.indices((N, N, N, N))
+    rep = teindex(i, j, k, l)
+    exc = teindex(i, k, l, j)
+
+    # build the inverse map from the canonical quartets
+    quartets = np.full((teint_size(N), 4), -1, dtype=np.int64)
+    canonical, idx = canonical_quartet_array(N)
+    quartets[idx] = canonical
+
+    for arr in (rep, exc, quartets):
+        arr.setflags(write=False)
+
+    return IndexMap(rep, exc, quartets)
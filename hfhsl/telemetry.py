@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import cProfile
+import json
+import os
+import time
+from contextlib import contextmanager
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+def array_bytes(*objects):
+    """
+    Return the total size in bytes of all NumPy arrays among the objects
+    and their attributes, e.g. the arrays held by a Fock builder
+    """
+    total = 0
+    for obj in objects:
+        if isinstance(obj, np.ndarray):
+            total += obj.nbytes
+        elif hasattr(obj, '__dict__'):
+            total += sum(v.nbytes for v in vars(obj).values() if isinstance(v, np.ndarray))
+
+    return total
+
+def _to_json(value):
+    """
+    Convert NumPy scalars and arrays such that these can be written as JSON
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError('Cannot write %s as JSON' % type(value).__name__)
+
+class Telemetry:
+    """
+    Timers and counters for the phases of a calculation
+
+    The time spent in every phase is collected using the phase context
+    manager and counters are increased using count. Both are accumulated
+    per record, which is written as a single line of JSON to output (a file
+    name or an open file) by flush, e.g. once for the setup and once per
+    SCF iteration, and over the whole run, which is written by finish.
+    When profile is set to a folder, every phase is run under cProfile and
+    the statistics are stored per phase as <phase>.prof in this folder;
+    these can be inspected using pstats or snakeviz.
+    """
+    def __init__(self, output=None, profile=None):
+        self.output = output
+        self.profile = profile
+        self.current = {'time': {}, 'counters': {}}
+        self.totals = {'time': {}, 'counters': {}, 'peaks': {}}
+        self.profilers = {}
+        self.start = time.perf_counter()
+        self.stream = None
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time the enclosed block of code as the given phase; phases must not
+        be nested when profiling
+        """
+        profiler = None
+        if self.profile is not None:
+            profiler = self.profilers.setdefault(name, cProfile.Profile())
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+            for record in (self.current, self.totals):
+                record['time'][name] = record['time'].get(name, 0.0) + elapsed
+
+    def count(self, name, value=1):
+        """
+        Increase the counter name by value
+        """
+        for record in (self.current, self.totals):
+            record['counters'][name] = record['counters'].get(name, 0) + int(value)
+
+    def peak(self, name, value):
+        """
+        Keep track of the largest value of name during the run
+        """
+        self.totals['peaks'][name] = max(self.totals['peaks'].get(name, value), value)
+
+    def emit(self, record):
+        """
+        Write a record as a single line of JSON
+        """
+        if self.output is None:
+            return
+        if self.stream is None:
+            if isinstance(self.output, str):
+                self.stream = open(self.output, 'a')
+            else:
+                self.stream = self.output
+        self.stream.write(json.dumps(record, default=_to_json) + '\n')
+        self.stream.flush()
+
+    def flush(self, event, **fields):
+        """
+        Write the timings and counters collected since the previous record
+        together with the given fields and start a new record
+        """
+        record = {'event': event}
+        record.update(fields)
+        record.update(self.current)
+        self.emit(record)
+        self.current = {'time': {}, 'counters': {}}
+
+    def finish(self, **fields):
+        """
+        Write the totals over the run together with the given fields, store
+        the profiles and return the totals
+        """
+        if resource is not None:
+            # ru_maxrss is given in kilobytes on Linux
+            self.peak('max_rss_bytes', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+        self.totals['walltime'] = time.perf_counter() - self.start
+
+        record = {'event': 'run'}
+        record.update(fields)
+        record.update(self.totals)
+        self.emit(record)
+
+        if self.profile is not None:
+            os.makedirs(self.profile, exist_ok=True)
+            for name, profiler in self.profilers.items():
+                profiler.dump_stats(os.path.join(self.profile, '%s.prof' % name))
+
+        if self.stream is not None and isinstance(self.output, str):
+            self.stream.close()
+            self.stream = None
+
+        return self.totals
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import sys
+import pytest
+
+# make the hfhsl package in the root of this repository available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hfhsl.molecules import build_molecule
+from hfhsl.scf import build_integrals
+
+# total energy of CO in the STO-3G basis set
+CO_ENERGY = -111.2234483
+
+@pytest.fixture(scope='session')
+def co():
+    """
+    Basis functions, nuclei and integrals of CO in the STO-3G basis set
+    """
+    cgfs, nuclei = build_molecule('co').build_basis('sto3g')
+    ints, _ = build_integrals(cgfs, nuclei, verbose=False)
+
+    return cgfs, nuclei, ints
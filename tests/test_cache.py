@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+from hfhsl.cache import IntegralCache
+from hfhsl.molecules import build_molecule
+from hfhsl.scf import calculate
+from conftest import CO_ENERGY
+
+def test_cache(tmp_path):
+    """
+    The integrals are cached for the in-core strategy
+    """
+    cache = IntegralCache(str(tmp_path))
+    res = calculate(build_molecule('co'), cache=cache, verbose=False)
+    assert res['strategy'] == 'incore'
+    assert len(os.listdir(str(tmp_path))) == 1
+
+    res = calculate(build_molecule('co'), cache=cache, verbose=False)
+    assert abs(res['energy'] - CO_ENERGY) < 1e-6
+
+def test_cache_memory_budget(tmp_path):
+    """
+    The integrals are neither built nor cached when the memory budget
+    requires the direct strategy
+    """
+    cache = IntegralCache(str(tmp_path))
+    res = calculate(build_molecule('co'), cache=cache, memory=1024, verbose=False)
+    assert res['strategy'] == 'direct'
+    assert os.listdir(str(tmp_path)) == []
+    assert abs(res['energy'] - CO_ENERGY) < 1e-6
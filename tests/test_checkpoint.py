@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import numpy as np
+from hfhsl.checkpoint import read_checkpoint
+from hfhsl.scf import scf
+from conftest import CO_ENERGY
+
+def test_resume_interrupted(co, tmp_path):
+    """
+    An interrupted calculation continues where it stopped
+    """
+    cgfs, nuclei, ints = co
+    ckpt = str(tmp_path / 'co.npz')
+    first = scf(cgfs, nuclei, ints=ints, maxiter=5, checkpoint=ckpt, verbose=False)
+    assert first['status'] == 'maxiter'
+
+    res = scf(cgfs, nuclei, ints=ints, maxiter=100, checkpoint=ckpt, verbose=False)
+    assert res['converged']
+    assert res['energies'][:5] == first['energies']
+    assert abs(res['energy'] - CO_ENERGY) < 1e-6
+
+def test_resume_at_maxiter(co, tmp_path):
+    """
+    A checkpoint of the last iteration yields the stored result
+    """
+    cgfs, nuclei, ints = co
+    ckpt = str(tmp_path / 'co.npz')
+    first = scf(cgfs, nuclei, ints=ints, maxiter=5, checkpoint=ckpt, verbose=False)
+    res = scf(cgfs, nuclei, ints=ints, maxiter=5, checkpoint=ckpt, verbose=False)
+
+    assert res['status'] == 'maxiter'
+    assert res['niter'] == 5
+    assert res['energy'] == first['energy']
+    assert res['energies'] == first['energies']
+    assert len(res['orbital_energies']) == len(cgfs)
+    np.testing.assert_allclose(res['P'], first['P'])
+
+def test_resume_converged(co, tmp_path):
+    """
+    A converged checkpoint is returned without further Fock builds
+    """
+    cgfs, nuclei, ints = co
+    ckpt = str(tmp_path / 'co.npz')
+    first = scf(cgfs, nuclei, ints=ints, checkpoint=ckpt, verbose=False)
+    assert read_checkpoint(ckpt)['converged']
+
+    res = scf(cgfs, nuclei, ints=ints, checkpoint=ckpt, verbose=False)
+    assert res['converged']
+    assert res['niter'] == first['niter']
+    assert res['energy'] == first['energy']
+    np.testing.assert_allclose(res['C'], first['C'])
+    np.testing.assert_allclose(res['orbital_energies'], first['orbital_energies'])
+
+def test_resume_tighter(co, tmp_path):
+    """
+    A converged checkpoint is iterated further for tighter criteria
+    """
+    cgfs, nuclei, ints = co
+    ckpt = str(tmp_path / 'co.npz')
+    first = scf(cgfs, nuclei, ints=ints, etol=1e-3, ptol=None, checkpoint=ckpt,
+                verbose=False)
+    assert first['converged']
+    assert abs(first['energy'] - CO_ENERGY) > 1e-5
+
+    res = scf(cgfs, nuclei, ints=ints, etol=1e-9, ptol=1e-8, checkpoint=ckpt,
+              verbose=False)
+    assert res['converged']
+    assert res['niter'] > first['niter']
+    assert res['energies'][:first['niter']] == first['energies']
+    assert abs(res['energy'] - CO_ENERGY) < 1e-6
+
+def test_resume_other_strategy(co, tmp_path):
+    """
+    A checkpoint of another strategy only serves as the initial guess
+    """
+    cgfs, nuclei, ints = co
+    ckpt = str(tmp_path / 'co.npz')
+    scf(cgfs, nuclei, strategy='cholesky', checkpoint=ckpt, verbose=False)
+
+    res = scf(cgfs, nuclei, ints=ints, strategy='incore', checkpoint=ckpt,
+              verbose=False)
+    assert res['converged']
+    assert read_checkpoint(ckpt)['strategy'] == 'incore'
+    assert abs(res['energy'] - CO_ENERGY) < 1e-6
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+from hfhsl.cholesky import cholesky_vectors
+from hfhsl.scf import scf
+from hfhsl.teindex import teint_size
+from conftest import CO_ENERGY
+
+def test_cholesky(co):
+    """
+    The Cholesky vectors reproduce the energy with fewer evaluated
+    integrals than there are unique integrals, and are stored over the
+    pairs of basis functions
+    """
+    cgfs, nuclei, _ = co
+    N = len(cgfs)
+    L, nevaluated = cholesky_vectors(cgfs, 1e-6)
+    assert nevaluated < teint_size(N)
+    assert L.shape[0] == N * (N + 1) // 2
+
+    res = scf(cgfs, nuclei, strategy='cholesky', cholesky_tol=1e-6, verbose=False)
+    assert abs(res['energy'] - CO_ENERGY) < 1e-5
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import numpy as np
+from hfhsl.convergence import ConvergenceControl
+from hfhsl.scan import build_geometry
+from hfhsl.scf import scf
+
+def feed(control, energies):
+    """
+    Pass the energies one by one to control; returns the first status
+    other than None together with its iteration
+    """
+    P = np.zeros((2,2))
+    for niter in range(len(energies)):
+        result = control.update(niter, energies[:niter+1], P, P)
+        if result is not None:
+            return result, niter
+
+    return None, len(energies)
+
+def test_converged():
+    control = ConvergenceControl(etol=1e-5, ptol=1e-4)
+    assert feed(control, [-1.0, -1.1, -1.1000001])[0] == 'converged'
+
+    # the change in the density matrix is too large
+    control = ConvergenceControl(etol=1e-5, ptol=1e-4)
+    P = np.eye(2)
+    assert control.update(2, [-1.0, -1.0], P, 0.9 * P) is None
+
+def test_diverged():
+    control = ConvergenceControl()
+    assert feed(control, [-1.0, -2.0, np.nan]) == ('diverged', 2)
+
+def test_stalled():
+    control = ConvergenceControl(patience=3)
+    assert feed(control, [0.0, -1.0, -3.0, -6.0, -10.0, -15.0])[0] == 'stalled'
+
+def test_oscillating():
+    energies = [-1.0, -2.0] * 20
+    control = ConvergenceControl(auto=False)
+    assert feed(control, energies) == ('oscillating', 4)
+
+    # the stabilization is escalated before the iterations are aborted
+    control = ConvergenceControl()
+    assert feed(control, energies)[0] == 'oscillating'
+    assert (control.damping, control.level_shift) == control.ladder[-1]
+
+def test_stabilized_diis():
+    """
+    Stretched CO oscillates with DIIS until the iterations are stabilized
+    """
+    mol = build_geometry([('C', 0.0, 0.0, -2.0), ('O', 0.0, 0.0, 2.0)])
+    cgfs, nuclei = mol.build_basis('sto3g')
+    res = scf(cgfs, nuclei, diis=True, verbose=False)
+    assert res['converged']
+    assert abs(res['energy'] - -110.79462) < 1e-5
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import numpy as np
+import pytest
+from hfhsl.eigensolver import Eigensolver
+from hfhsl.scf import scf
+from conftest import CO_ENERGY
+
+@pytest.mark.parametrize('method', ['full', 'subset', 'lobpcg'])
+def test_eigensolver(method):
+    """
+    The lowest eigenpairs agree with the full diagonalization
+    """
+    rng = np.random.default_rng(7)
+    A = rng.standard_normal((40,40))
+    A = A + A.transpose() + np.diag(np.arange(40.0))
+    ref, Vref = np.linalg.eigh(A)
+
+    solver = Eigensolver(5, method)
+    for shift in (0.0, 1e-3):
+        e, V = solver.solve(A + shift * np.eye(40))
+        np.testing.assert_allclose(e[:5], ref[:5] + shift, atol=1e-6)
+        np.testing.assert_allclose(np.abs(np.sum(V[:,:5] * Vref[:,:5], axis=0)), 1.0, atol=1e-6)
+
+@pytest.mark.parametrize('method', ['full', 'subset', 'lobpcg'])
+def test_eigensolver_scf(co, method):
+    """
+    Every eigensolver reproduces the reference energy and yields all
+    orbital energies
+    """
+    cgfs, nuclei, ints = co
+    res = scf(cgfs, nuclei, ints=ints, eigensolver=method, verbose=False)
+    assert res['converged']
+    assert abs(res['energy'] - CO_ENERGY) < 1e-6
+    assert len(res['orbital_energies']) == len(cgfs)
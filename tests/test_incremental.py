@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+from hfhsl.scf import scf
+from conftest import CO_ENERGY
+
+def test_incremental(co):
+    """
+    Incremental Fock builds reproduce the energy, also when G is never
+    rebuilt from the full density matrix
+    """
+    cgfs, nuclei, ints = co
+    for rebuild in (10, 0):
+        res = scf(cgfs, nuclei, ints=ints, diis=True, incremental=True,
+                  rebuild=rebuild, verbose=False)
+        assert res['converged']
+        assert abs(res['energy'] - CO_ENERGY) < 1e-6
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import numpy as np
+from hfhsl.molecules import build_molecule
+from hfhsl.ri import RIFock, three_index, two_index
+from hfhsl.scf import build_integrals, scf
+from hfhsl.shells import build_shells
+from hfhsl.teindex import teindex
+from conftest import CO_ENERGY
+
+def test_three_index():
+    """
+    With products of basis functions as auxiliary functions, the three- and
+    two-index integrals equal the four-index repulsion integrals
+    """
+    cgfs, nuclei = build_molecule('h2o').build_basis('sto3g')
+    S, T, V, teint = build_integrals(cgfs, nuclei, verbose=False)[0]
+    shells = build_shells(cgfs)
+    aux = [(sa, sb) for a, sa in enumerate(shells) for sb in shells[:a+1]
+           if np.allclose(sa.center, sb.center)]
+    products = [(k, l) for sa, sb in aux for k in sa.indices for l in sb.indices]
+
+    B = three_index(cgfs, aux)
+    M = two_index(aux)
+    N = len(cgfs)
+    for P, (k, l) in enumerate(products):
+        exact = np.array([[teint[teindex(i,j,k,l)] for j in range(N)] for i in range(N)])
+        np.testing.assert_allclose(B[P] / np.sqrt(M[P,P]),
+                                   exact / np.sqrt(teint[teindex(k,l,k,l)]), atol=1e-5)
+
+def test_ri(co):
+    """
+    Density fitting reproduces the energy to within 1e-4 Ht and stores its
+    factors over the pairs of basis functions
+    """
+    cgfs, nuclei, _ = co
+    N = len(cgfs)
+    assert RIFock(cgfs, nuclei).L.shape[0] == N * (N + 1) // 2
+
+    res = scf(cgfs, nuclei, strategy='ri', diis=True, verbose=False)
+    assert res['converged']
+    assert abs(res['energy'] - CO_ENERGY) < 1e-4
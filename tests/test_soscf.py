@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import numpy as np
+from hfhsl.molecules import build_molecule
+from hfhsl.scf import scf
+from hfhsl.soscf import SecondOrderSCF
+from conftest import CO_ENERGY
+
+def test_soscf(co):
+    """
+    Second-order orbital rotations reproduce the reference energy
+    """
+    cgfs, nuclei, ints = co
+    for start in (0.1, np.inf):
+        res = scf(cgfs, nuclei, ints=ints, soscf=True, soscf_start=start, verbose=False)
+        assert res['converged']
+        assert res['soscf_iteration'] is not None
+        assert abs(res['energy'] - CO_ENERGY) < 1e-6
+
+def test_soscf_rejects_step():
+    """
+    A step that raises the energy is retried from the previous orbitals
+    with a shorter step
+    """
+    rng = np.random.default_rng(42)
+    F = rng.standard_normal((6,6))
+    F = F + F.transpose()
+    C = np.linalg.qr(rng.standard_normal((6,6)))[0]
+    newton = SecondOrderSCF(2)
+    e, Cstart, C1, _ = newton.step(F, C, -1.0)
+    length = np.linalg.norm(newton.last_step)
+
+    e, Cretry, C2, _ = newton.step(F, C1, 0.0)
+    np.testing.assert_allclose(Cretry, Cstart)
+    assert newton.trust == 0.5 * length
+    assert np.linalg.norm(newton.last_step) <= newton.trust + 1e-12
+
+def test_soscf_symmetry(capsys):
+    """
+    The rotated orbitals are assigned to irreps as well
+    """
+    cgfs, nuclei = build_molecule('h2o').build_basis('sto3g')
+    ref = scf(cgfs, nuclei, symmetry=True, verbose=False)
+    res = scf(cgfs, nuclei, symmetry=True, soscf=True, soscf_start=np.inf)
+    assert res['converged']
+    assert res['irreps'] == ref['irreps']
+    assert 'Point group: C2v' in capsys.readouterr().out
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+from hfhsl.strategy import estimate_memory, select_strategy
+
+def test_select_strategy(tmp_path):
+    """
+    The strategy follows the memory budget and the message names the
+    check that ruled out the disk strategy
+    """
+    N = 10
+    required = estimate_memory(N)
+    assert select_strategy(N, required['incore'], str(tmp_path))[0] == 'incore'
+    assert select_strategy(N, required['disk'], str(tmp_path))[0] == 'disk'
+
+    strategy, message = select_strategy(N, required['disk'] - 1, str(tmp_path))
+    assert strategy == 'direct'
+    assert 'reading these from disk' in message
+    assert 'free' not in message
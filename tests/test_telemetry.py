@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+# 
+# This file is part of the HFHSL2021 distribution (https://github.com/ifilot/hfhsl2021).
+# Copyright (c) 2021 Ivo Filot <i.a.w.filot@tue.nl>
+# 
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+from hfhsl.molecules import build_molecule
+from hfhsl.scf import scf
+
+def test_direct_counters():
+    """
+    In direct mode, the integrals of the Cauchy-Schwarz bounds are counted
+    as evaluated and the screened integrals as skipped; every iteration
+    either evaluates or skips each unique integral
+    """
+    cgfs, nuclei = build_molecule('h10').build_basis('sto3g')
+    N = len(cgfs)
+    npair = N * (N + 1) // 2
+    res = scf(cgfs, nuclei, strategy='direct', threshold=1e-8, guess='core',
+              verbose=False)
+    counters = res['telemetry']['counters']
+
+    assert counters['integrals_skipped'] > 0
+    assert 'density_skipped' not in counters
+    assert counters['integrals_evaluated'] + counters['integrals_skipped'] == \
+        npair + res['niter'] * npair * (npair + 1) // 2